@@ -13,24 +13,48 @@ import logging
 import argparse
 import importlib.metadata
 import json
+import hashlib
+import html
+import math
+import mimetypes
+import re
+import threading
+import time
+import queue
+import logging.handlers
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from urllib.parse import urlsplit
 
 from PyQt5.QtWebEngine import QtWebEngine
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QHBoxLayout, QVBoxLayout, QTreeWidget, QTreeWidgetItem,
-                             QScrollArea, QSizePolicy, QMessageBox, QPushButton, QLabel, QColorDialog, QDialog)
+                             QScrollArea, QSizePolicy, QMessageBox, QPushButton, QLabel, QColorDialog, QDialog,
+                             QTabWidget, QPlainTextEdit, QSystemTrayIcon)
 from PyQt5.QtWebEngineWidgets import QWebEngineView, QWebEnginePage, QWebEngineSettings
-from PyQt5.QtCore import QObject, pyqtSlot, QUrl, Qt, QCoreApplication, QSettings
-from PyQt5.QtGui import QDesktopServices, QFont, QFontDatabase, QColor
+from PyQt5.QtWebEngineCore import QWebEngineUrlRequestInterceptor, QWebEngineUrlRequestInfo
+from PyQt5.QtSvg import QSvgRenderer
+from PyQt5.QtCore import QObject, pyqtSlot, pyqtSignal, QUrl, Qt, QCoreApplication, QSettings, QTimer
+from PyQt5.QtGui import QDesktopServices, QFont, QFontDatabase, QColor, QIcon, QImage, QPainter
 from PyQt5.QtWebChannel import QWebChannel
 from PyQt5.QtCore import QT_VERSION_STR, PYQT_VERSION_STR
 
+from content_snapshot import VENDOR_ASSETS
+from local_cache_server import LocalCacheServer
+from warframe_data_client import PROXIED_API_HOSTS, PROXIED_IMAGE_HOSTS, get_cache_directory, get_data_client
+from worldstate_alerts import AlertEngine
+from worldstate_history import WorldstateHistory
 
-def setup_qt_resources():
+
+def get_bundle_directory():
     if getattr(sys, 'frozen', False):
         # Ha a script be van fagyasztva (PyInstaller által csomagolva)
-        bundle_dir = sys._MEIPASS
-    else:
-        # Ha a script normálisan fut
-        bundle_dir = os.path.dirname(os.path.abspath(__file__))
+        return sys._MEIPASS
+    # Ha a script normálisan fut
+    return os.path.dirname(os.path.abspath(__file__))
+
+
+def setup_qt_resources():
+    bundle_dir = get_bundle_directory()
 
     qt_dir = os.path.join(bundle_dir, 'PyQt5', 'Qt5')
     os.environ['QT_PLUGIN_PATH'] = os.path.join(qt_dir, 'plugins')
@@ -49,6 +73,12 @@ try:
 except ImportError:
     QWebEngineProfile = None
 
+# A psutil opcionális, nélküle csak Linuxon (/proc) mérünk memóriát
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
 print("Qt: v", QT_VERSION_STR, "\tPyQt: v", PYQT_VERSION_STR)
 
 def get_platform_specific_styles():
@@ -210,23 +240,765 @@ def get_platform_specific_settings():
 def get_temp_directory():
     return tempfile.gettempdir()
 
-def get_cache_directory():
-    system = platform.system().lower()
-    if system == 'windows':
-        return os.path.join(os.environ.get('LOCALAPPDATA'), 'WarframeInfoHub')
-    elif system == 'darwin':
-        return os.path.expanduser('~/Library/Caches/WarframeInfoHub')
-    else:  # Linux és egyéb
-        return os.path.expanduser('~/.cache/WarframeInfoHub')
+def get_process_memory_mb(pid):
+    # Egy folyamat rezidens memóriája MB-ban, ha lekérdezhető
+    if not pid:
+        return None
+    if psutil is not None:
+        try:
+            return psutil.Process(pid).memory_info().rss / (1024 * 1024)
+        except psutil.Error:
+            return None
+    try:
+        with open(f"/proc/{pid}/statm", 'r') as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+WORLDSTATE_POLL_INTERVAL = 60
+
+
+class WorldstateMonitor(QObject):
+    # Háttérszálon lekérdezi a worldstate-et, gyorsítótárazza, és kiértékeli a figyelési szabályokat
+    alert_triggered = pyqtSignal(str, str)
+
+    def __init__(self, client, history=None, parent=None):
+        super().__init__(parent)
+        self.client = client
+        self.history = history
+        self.rules_path = os.path.join(client.cache_dir, 'alert_rules.json')
+        self.state_path = os.path.join(client.cache_dir, 'alert_state.json')
+        # A már jelzett entitásokat elmentjük, így újraindítás után sem jelzünk ismét ugyanarra,
+        # a közben felvett szabályok viszont a már aktív entitásokra is lefutnak
+        self.engine = AlertEngine(fired=self.load_fired())
+        self.rules_mtime = None
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self.run, name="WorldstateMonitor", daemon=True)
+        self.reload_rules()
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+
+    def load_fired(self):
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                return json.load(f).get('fired', [])
+        except (OSError, json.JSONDecodeError, AttributeError) as e:
+            if os.path.exists(self.state_path):
+                logging.error(f"Error loading alert state: {str(e)}")
+            return []
+
+    def save_fired(self):
+        temp_path = self.state_path + '.tmp'
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({'fired': self.engine.fired_state()}, f)
+            os.replace(temp_path, self.state_path)
+        except OSError as e:
+            logging.error(f"Error saving alert state: {str(e)}")
+
+    def reload_rules(self):
+        try:
+            mtime = os.path.getmtime(self.rules_path)
+        except OSError:
+            mtime = None
+        if mtime == self.rules_mtime:
+            return
+        self.rules_mtime = mtime
+        rules = []
+        if mtime is not None:
+            try:
+                with open(self.rules_path, 'r', encoding='utf-8') as f:
+                    rules = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                # Hibás fájlnál a korábbi szabályok maradnak érvényben
+                logging.error(f"Error loading alert rules: {str(e)}")
+                return
+            if not isinstance(rules, list):
+                logging.error("Error loading alert rules: the file must contain a list of rules")
+                return
+        self.engine.set_rules(rules)
+        logging.info(f"Loaded {len(self.engine.rules)} alert rule(s)")
+
+    def poll(self):
+        self.reload_rules()
+        try:
+            worldstate = self.client.fetch_worldstate()
+        except (requests.exceptions.RequestException, ValueError, OSError) as e:
+            logging.error(f"Error polling worldstate: {str(e)}")
+            return
+        if self.history is not None:
+            try:
+                self.history.record(worldstate)
+            except (OSError, TypeError, ValueError) as e:
+                logging.error(f"Error recording worldstate history: {str(e)}")
+        fired = set(self.engine.fired)
+        for rule, entity in self.engine.evaluate(worldstate):
+            self.alert_triggered.emit("Warframe Info Hub", AlertEngine.describe(rule, entity))
+        if self.engine.fired != fired:
+            self.save_fired()
+
+    def run(self):
+        while not self.stop_event.is_set():
+            # Egy váratlan hiba se állítsa le a figyelést és a történet rögzítését
+            try:
+                self.poll()
+            except Exception:
+                logging.exception("Unexpected error while polling worldstate")
+            self.stop_event.wait(WORLDSTATE_POLL_INTERVAL)
+
+
+class AlertNotifier(QObject):
+    # Tálcaértesítés, ha elérhető; egyébként a főablak állapotsorában jelenik meg az üzenet
+    MESSAGE_TIMEOUT_MS = 10000
+
+    def __init__(self, main_window):
+        super().__init__(main_window)
+        self.main_window = main_window
+        self.tray_icon = None
+        if QSystemTrayIcon.isSystemTrayAvailable():
+            icon = QIcon(os.path.join(get_bundle_directory(), 'Icons', 'AppIcon_norm.png'))
+            self.tray_icon = QSystemTrayIcon(icon, self)
+            self.tray_icon.setToolTip("Warframe Info Hub")
+            self.tray_icon.show()
+
+    def notify(self, title, message):
+        logging.info(f"Alert: {message}")
+        if self.tray_icon is not None and QSystemTrayIcon.supportsMessages():
+            self.tray_icon.showMessage(title, message, QSystemTrayIcon.Information, self.MESSAGE_TIMEOUT_MS)
+        else:
+            self.main_window.statusBar().showMessage(message, self.MESSAGE_TIMEOUT_MS)
+
 
 class WebBridge(QObject):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.history = None
+
     @pyqtSlot(str)
     def open_url(self, url):
         QDesktopServices.openUrl(QUrl(url))
 
+    @pyqtSlot(str, result=str)
+    def query_history(self, query_json):
+        # Pl. {"type": "fissures", "days": 365, "group_by": "node"} vagy {"type": "voidTrader", "fields": ["inventory"]}
+        if self.history is None:
+            return json.dumps({'error': 'History is not available'})
+        try:
+            return json.dumps(self.history.run_query(json.loads(query_json)))
+        except (ValueError, KeyError, TypeError, OSError) as e:
+            logging.error(f"Error querying history: {str(e)}")
+            return json.dumps({'error': str(e)})
+
+class JSConsoleLogSink:
+    # A JS konzol üzeneteit szűri, forrásonként korlátozza, és háttérszálon írja fájlba
+    RING_BUFFER_SIZE = 1000
+    RATE_LIMIT_PER_SECOND = 5.0
+    RATE_LIMIT_BURST = 20
+    LOG_FILE_MAX_BYTES = 1024 * 1024
+    LOG_FILE_BACKUP_COUNT = 3
+    LEVEL_NAMES = {0: "INFO", 1: "WARNING", 2: "ERROR"}
+    LOGGING_LEVELS = {0: logging.INFO, 1: logging.WARNING, 2: logging.ERROR}
+
+    def __init__(self, log_path, min_level=1, echo=False):
+        self.min_level = min_level
+        self.buffer = deque(maxlen=self.RING_BUFFER_SIZE)
+        self.dropped = 0
+        self._buckets = {}
+
+        os.makedirs(os.path.dirname(log_path), exist_ok=True)
+        file_handler = logging.handlers.RotatingFileHandler(
+            log_path, maxBytes=self.LOG_FILE_MAX_BYTES, backupCount=self.LOG_FILE_BACKUP_COUNT, encoding='utf-8')
+        file_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+        handlers = [file_handler]
+        if echo:
+            stream_handler = logging.StreamHandler(sys.stdout)
+            stream_handler.setFormatter(logging.Formatter('JS Console: %(message)s'))
+            handlers.append(stream_handler)
+
+        self._queue = queue.SimpleQueue()
+        self.listener = logging.handlers.QueueListener(self._queue, *handlers)
+        self.listener.start()
+
+        self.logger = logging.getLogger('WarframeInfoHub.js_console')
+        self.logger.propagate = False
+        self.logger.setLevel(logging.DEBUG)
+        self.logger.handlers = [logging.handlers.QueueHandler(self._queue)]
+
+    def _allow(self, source, now):
+        tokens, last, suppressed = self._buckets.get(source, (self.RATE_LIMIT_BURST, now, 0))
+        tokens = min(self.RATE_LIMIT_BURST, tokens + (now - last) * self.RATE_LIMIT_PER_SECOND)
+        if tokens < 1:
+            self._buckets[source] = (tokens, now, suppressed + 1)
+            self.dropped += 1
+            return False, 0
+        self._buckets[source] = (tokens - 1, now, 0)
+        return True, suppressed
+
+    def log(self, level, message, line_number, source_id):
+        level = int(level)
+        if level < self.min_level:
+            return
+        now = time.monotonic()
+        allowed, suppressed = self._allow(source_id, now)
+        if not allowed:
+            return
+        if suppressed:
+            message = f"{message} ({suppressed} suppressed message(s) before this)"
+
+        self.buffer.append((time.time(), level, message, line_number, source_id))
+        self.logger.log(self.LOGGING_LEVELS.get(level, logging.INFO),
+                        "%s (line %s, source: %s)", message, line_number, source_id)
+
+    def format_buffer(self):
+        lines = []
+        for timestamp, level, message, line_number, source_id in self.buffer:
+            when = time.strftime('%H:%M:%S', time.localtime(timestamp))
+            lines.append(f"{when} [{self.LEVEL_NAMES.get(level, level)}] {message} "
+                         f"(line {line_number}, source: {source_id})")
+        if self.dropped:
+            lines.append(f"--- {self.dropped} message(s) dropped by rate limiting ---")
+        return "\n".join(lines)
+
+    def close(self):
+        self.listener.stop()
+
+
+_js_console_sink = None
+
+
+def get_js_console_sink():
+    global _js_console_sink
+    if _js_console_sink is None:
+        debug = '--debug' in sys.argv
+        log_path = os.path.join(get_cache_directory(), 'logs', 'js_console.log')
+        _js_console_sink = JSConsoleLogSink(log_path, min_level=0 if debug else 1, echo=debug)
+        app = QApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(_js_console_sink.close)
+    return _js_console_sink
+
+
 class CustomWebEnginePage(QWebEnginePage):
     def javaScriptConsoleMessage(self, level, message, lineNumber, sourceID):
-        print(f"JS Console: {message} (line {lineNumber}, source: {sourceID})")
+        get_js_console_sink().log(level, message, lineNumber, sourceID)
+
+
+class DebugPanel(QDialog):
+    REFRESH_INTERVAL_MS = 1000
+
+    def __init__(self, main_window, parent=None):
+        super().__init__(parent)
+        self.main_window = main_window
+        self.setWindowTitle("Debug panel")
+        self.resize(900, 500)
+        self.layout = QVBoxLayout(self)
+
+        self.tabs = QTabWidget()
+        self.sections = {}
+        for title, provider in self.section_providers():
+            view = QPlainTextEdit()
+            view.setReadOnly(True)
+            view.setLineWrapMode(QPlainTextEdit.NoWrap)
+            self.tabs.addTab(view, title)
+            self.sections[title] = (view, provider)
+        self.layout.addWidget(self.tabs)
+
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(self.REFRESH_INTERVAL_MS)
+        self.refresh_timer.timeout.connect(self.refresh)
+
+    def section_providers(self):
+        return [
+            ("JS konzol", lambda: get_js_console_sink().format_buffer()),
+            ("Oldalak", self.format_page_memory),
+            ("Letöltések", self.format_download_stats),
+        ]
+
+    def format_page_memory(self):
+        lines = []
+        for entry in self.main_window.page_lifecycle.memory_report():
+            memory = "n/a" if entry['memory_mb'] is None else f"{entry['memory_mb']:.1f} MB"
+            lines.append(f"{entry['state']:<10} pid={entry['pid']:<8} {memory:>10}  {entry['url']}")
+        return "\n".join(lines)
+
+    def format_download_stats(self):
+        client = get_data_client()
+        lines = [f"Coalesced requests: {client.flights.coalesced}"]
+        if _local_cache_server is not None:
+            stats = _local_cache_server.stats
+            lines.append(f"Proxied page API requests: {stats['api_requests']}")
+            lines.append(f"Proxied image requests: {stats['image_requests']}")
+        latency_report = client.latency.format_report()
+        if latency_report:
+            lines.extend(["", "Endpoint latency:", latency_report])
+        return "\n".join(lines)
+
+    def refresh(self):
+        view, provider = self.sections[self.tabs.tabText(self.tabs.currentIndex())]
+        text = provider()
+        if view.toPlainText() != text:
+            view.setPlainText(text)
+            view.verticalScrollBar().setValue(view.verticalScrollBar().maximum())
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh()
+        self.refresh_timer.start()
+
+    def hideEvent(self, event):
+        self.refresh_timer.stop()
+        super().hideEvent(event)
+
+THEME_COLORS = {
+    "light": {
+        "background": "#ffffff",
+        "text": "#000000",
+        "button": "#e0e0e0",
+        "button_border": "#b0b0b0",
+        "tree_background": "#f0f0f0",
+        "tree_text": "#333333",
+        "tree_border": "#e0e0e0",
+        "hover": "#e0e0e0",
+        "selected": "#a0a0a0",
+        "selected_text": "#ffffff",
+        "scroll_background": "#f0f0f0",
+    },
+    "dark": {
+        "background": "#2b2b2b",
+        "text": "#ffffff",
+        "button": "#3b3b3b",
+        "button_border": "#505050",
+        "tree_background": "#2b2b2b",
+        "tree_text": "#ffffff",
+        "tree_border": "#3b3b3b",
+        "hover": "#3b3b3b",
+        "selected": "#505050",
+        "selected_text": "#ffffff",
+        "scroll_background": "#1b1b1b",
+    },
+}
+
+CUSTOM_THEME_KEYS = ['background', 'text', 'button', 'border', 'highlight']
+
+THEME_STYLESHEET_TEMPLATE = """
+    QWidget {{ background-color: {background}; color: {text}; }}
+    QPushButton {{ background-color: {button}; border: 1px solid {button_border}; padding: 5px; }}
+    QTreeWidget {{
+        border: none;
+        background-color: {tree_background};
+        color: {tree_text};
+    }}
+    QTreeWidget::item {{
+        padding: 10px;
+        border-bottom: 1px solid {tree_border};
+    }}
+    QTreeWidget::item:hover {{
+        background-color: {hover};
+    }}
+    QTreeWidget::item:selected {{
+        background-color: {selected};
+        color: {selected_text};
+    }}
+    QScrollArea {{ background-color: {scroll_background}; }}
+    QWebEngineView {{ background-color: {background}; }}
+"""
+
+
+# Csak az ismert (height attribútumos) megjelenítési méretre kicsinyítünk; a többi kép eredeti méretben,
+# cache-elve jön
+IMG_TAG_PATTERN = re.compile(r'<img\b[^>]*>', re.IGNORECASE)
+IMG_SRC_PATTERN = re.compile(r'\bsrc="([^"]+)"', re.IGNORECASE)
+IMG_HEIGHT_PATTERN = re.compile(r'\bheight="(\d+)"', re.IGNORECASE)
+
+
+def route_images_through_cache(html_content, device_pixel_ratio=1.0):
+    # A távoli <img> címeket a helyi képcache-re írja át, és ismert magasságnál a kicsinyítést azonnal elindítja
+    cache_server = get_local_cache_server()
+    thumbnailer = get_image_thumbnailer()
+
+    def replace(match):
+        tag = match.group(0)
+        src = IMG_SRC_PATTERN.search(tag)
+        if src is None:
+            return tag
+        url = html.unescape(src.group(1))
+        if urlsplit(url).hostname not in PROXIED_IMAGE_HOSTS:
+            return tag
+        height_match = IMG_HEIGHT_PATTERN.search(tag)
+        if height_match is None:
+            new_src = html.escape(cache_server.image_url(url), quote=True)
+            return tag[:src.start(1)] + new_src + tag[src.end(1):]
+        css_height = int(height_match.group(1))
+        height = max(1, math.ceil(css_height * device_pixel_ratio))
+        thumbnailer.request(url, height)
+        new_src = html.escape(cache_server.image_url(url, height), quote=True)
+        tag = tag[:src.start(1)] + new_src + tag[src.end(1):]
+        if 'style=' not in tag.lower():
+            # A nagyobb felbontású bélyegkép a megadott magasságban jelenjen meg (a CSS height:auto helyett)
+            tag = tag[:4] + f' style="height: {css_height}px; width: auto;"' + tag[4:]
+        return tag
+
+    return IMG_TAG_PATTERN.sub(replace, html_content)
+
+
+class ApiCacheInterceptor(QWebEngineUrlRequestInterceptor):
+    # Az ismert API hostokra menő GET kéréseket és a CDN-es szkripteket a helyi, cache-elt végpontra irányítja át
+    def __init__(self, cache_server, parent=None):
+        super().__init__(parent)
+        self.cache_server = cache_server
+
+    def interceptRequest(self, info):
+        url = info.requestUrl()
+        if bytes(info.requestMethod()) != b'GET':
+            return
+        if url.host() in PROXIED_API_HOSTS:
+            path = url.path(QUrl.FullyEncoded) or '/'
+            info.redirect(QUrl(self.cache_server.api_url(url.host(), path, url.query(QUrl.FullyEncoded))))
+        elif url.toString(QUrl.FullyEncoded) in VENDOR_ASSETS:
+            info.redirect(QUrl(self.cache_server.vendor_url(url.toString(QUrl.FullyEncoded))))
+        elif (url.host() in PROXIED_IMAGE_HOSTS
+              and info.resourceType() == QWebEngineUrlRequestInfo.ResourceTypeImage):
+            # Az oldal JS/CSS-e által kért képek megjelenítési méretét nem ismerjük: az eredetit adjuk, cache-ből
+            info.redirect(QUrl(self.cache_server.image_url(url.toString(QUrl.FullyEncoded))))
+
+
+class ImageThumbnailer:
+    # A képeket egyszer tölti le, és a felület által használt magasságra előre raszterizálja egy szálkészletben
+    MAX_WORKERS = 4
+
+    def __init__(self, client):
+        self.client = client
+        self.root = os.path.join(client.cache_dir, 'images', 'thumbnails')
+        os.makedirs(self.root, exist_ok=True)
+        self.pool = ThreadPoolExecutor(max_workers=self.MAX_WORKERS, thread_name_prefix="Thumbnailer")
+        self.lock = threading.Lock()
+        self.futures = {}
+
+    def thumbnail_path(self, url, height):
+        return os.path.join(self.root, f"{hashlib.sha1(url.encode('utf-8')).hexdigest()}_{height}.png")
+
+    def request(self, url, height):
+        # Ugyanarra a képre és méretre futó feladatot nem indítunk el még egyszer
+        path = self.thumbnail_path(url, height)
+        with self.lock:
+            future = self.futures.get(path)
+            if future is None:
+                if os.path.exists(path):
+                    future = Future()
+                    future.set_result((path, 'image/png'))
+                    return future
+                future = self.pool.submit(self.render, url, height, path)
+                self.futures[path] = future
+                future.add_done_callback(lambda _, key=path: self._forget(key))
+        return future
+
+    def _forget(self, path):
+        with self.lock:
+            self.futures.pop(path, None)
+
+    def provide(self, url, height):
+        return self.request(url, height).result()
+
+    def render(self, url, height, path):
+        source = self.client.get_image(url)
+        if source.lower().endswith('.svg'):
+            renderer = QSvgRenderer(source)
+            if not renderer.isValid():
+                return source, 'image/svg+xml'
+            size = renderer.defaultSize()
+            width = max(1, round(size.width() * height / max(1, size.height())))
+            image = QImage(width, height, QImage.Format_ARGB32_Premultiplied)
+            image.fill(Qt.transparent)
+            painter = QPainter(image)
+            renderer.render(painter)
+            painter.end()
+        else:
+            image = QImage(source)
+            if image.isNull():
+                return source, mimetypes.guess_type(url.split('?', 1)[0])[0]
+            if image.height() > height:
+                image = image.scaledToHeight(height, Qt.SmoothTransformation)
+
+        temp_path = path + '.tmp.png'
+        if not image.save(temp_path, 'PNG'):
+            return source, mimetypes.guess_type(url.split('?', 1)[0])[0]
+        os.replace(temp_path, path)
+        return path, 'image/png'
+
+
+_image_thumbnailer = None
+
+
+def get_image_thumbnailer():
+    global _image_thumbnailer
+    if _image_thumbnailer is None:
+        _image_thumbnailer = ImageThumbnailer(get_data_client())
+    return _image_thumbnailer
+
+
+_local_cache_server = None
+
+
+def get_local_cache_server():
+    global _local_cache_server
+    if _local_cache_server is None:
+        _local_cache_server = LocalCacheServer(get_data_client(), image_provider=get_image_thumbnailer().provide)
+        _local_cache_server.start()
+        app = QApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(_local_cache_server.stop)
+    return _local_cache_server
+
+
+WEB_PROFILE_NAME = "WarframeInfoHub"
+WEB_HTTP_CACHE_MAX_SIZE = 256 * 1024 * 1024
+
+_web_profile = None
+
+
+def get_web_profile():
+    # Saját, névvel ellátott profil a gyorsítótár könyvtárban, lemezes HTTP cache-sel
+    global _web_profile
+    if _web_profile is None and QWebEngineProfile is not None:
+        profile_dir = os.path.join(get_cache_directory(), 'webengine')
+        profile = QWebEngineProfile(WEB_PROFILE_NAME, QApplication.instance())
+        profile.setCachePath(os.path.join(profile_dir, 'cache'))
+        profile.setPersistentStoragePath(os.path.join(profile_dir, 'storage'))
+        profile.setHttpCacheType(QWebEngineProfile.DiskHttpCache)
+        profile.setHttpCacheMaximumSize(WEB_HTTP_CACHE_MAX_SIZE)
+        profile.setPersistentCookiesPolicy(QWebEngineProfile.NoPersistentCookies)
+
+        profile.setHttpUserAgent(
+            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+            "AppleWebKit/537.36 (KHTML, like Gecko) "
+            "Chrome/91.0.4472.124 Safari/537.36")
+
+        profile.api_interceptor = ApiCacheInterceptor(get_local_cache_server(), profile)
+        if hasattr(profile, 'setUrlRequestInterceptor'):
+            profile.setUrlRequestInterceptor(profile.api_interceptor)
+        else:
+            profile.setRequestInterceptor(profile.api_interceptor)
+        _web_profile = profile
+    return _web_profile
+
+
+class PageLifecycleManager(QObject):
+    # A rejtett vagy tartalék oldalakat memórianyomás esetén lefagyasztja, majd eldobja
+    MEMORY_CHECK_INTERVAL_MS = 30000
+    MEMORY_PRESSURE_LIMIT_MB = 1024
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.pages = []
+        self.supported = hasattr(QWebEnginePage, 'LifecycleState')
+        self.timer = QTimer(self)
+        self.timer.setInterval(self.MEMORY_CHECK_INTERVAL_MS)
+        self.timer.timeout.connect(self.check_memory)
+        self.timer.start()
+
+    def register(self, page):
+        self.pages.append(page)
+        page.destroyed.connect(lambda _=None, p=page: self.unregister(p))
+        if self.supported:
+            page.visibleChanged.connect(lambda visible, p=page: self.on_visibility_changed(p, visible))
+
+    def unregister(self, page):
+        if page in self.pages:
+            self.pages.remove(page)
+
+    def on_visibility_changed(self, page, visible):
+        if visible and page.lifecycleState() != QWebEnginePage.LifecycleState.Active:
+            page.setLifecycleState(QWebEnginePage.LifecycleState.Active)
+
+    def memory_report(self):
+        # Oldalanként a renderelő folyamat memóriája; azonos folyamatot használó oldalak ugyanazt mutatják
+        report = []
+        for page in self.pages:
+            pid = page.renderProcessPid() if hasattr(page, 'renderProcessPid') else 0
+            report.append({
+                'url': page.url().toString(),
+                'pid': pid,
+                'visible': page.isVisible() if self.supported else True,
+                'state': self.state_name(page),
+                'memory_mb': get_process_memory_mb(pid),
+            })
+        return report
+
+    def state_name(self, page):
+        if not self.supported:
+            return "Active"
+        state = page.lifecycleState()
+        for name in ("Active", "Frozen", "Discarded"):
+            if state == getattr(QWebEnginePage.LifecycleState, name):
+                return name
+        return str(state)
+
+    def check_memory(self):
+        report = self.memory_report()
+        total_mb = get_process_memory_mb(os.getpid()) or 0
+        seen_pids = set()
+        for entry in report:
+            if entry['memory_mb'] is not None and entry['pid'] not in seen_pids:
+                seen_pids.add(entry['pid'])
+                total_mb += entry['memory_mb']
+            logging.debug(f"Page memory: {entry['url']} pid={entry['pid']} state={entry['state']} "
+                          f"memory={entry['memory_mb']} MB")
+
+        if not self.supported or total_mb < self.MEMORY_PRESSURE_LIMIT_MB:
+            return
+
+        logging.info(f"Memory pressure ({total_mb:.0f} MB), freezing hidden pages")
+        states = QWebEnginePage.LifecycleState
+        for page in self.pages:
+            if page.isVisible():
+                continue
+            if page.lifecycleState() == states.Active:
+                page.setLifecycleState(states.Frozen)
+            elif page.lifecycleState() == states.Frozen:
+                page.setLifecycleState(states.Discarded)
+
+
+class ThemeEngine:
+    # A témákat egyszer fordítja le stíluslappá, és egy lépésben alkalmazza őket
+    SETTINGS_FLUSH_DELAY_MS = 500
+
+    def __init__(self, settings=None):
+        self.settings = settings if settings is not None else QSettings("WarframeInfoHub", "ThemeSettings")
+        self.current_theme = None
+        self._compiled = {}
+        self._custom_theme = None
+        self._custom_theme_loaded = False
+        self._pending_settings = {}
+        self._flush_timer = QTimer()
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(self.SETTINGS_FLUSH_DELAY_MS)
+        self._flush_timer.timeout.connect(self.flush_settings)
+
+    @staticmethod
+    def colors_from_custom_theme(theme):
+        return {
+            "background": theme['background'],
+            "text": theme['text'],
+            "button": theme['button'],
+            "button_border": theme['border'],
+            "tree_background": theme['background'],
+            "tree_text": theme['text'],
+            "tree_border": theme['border'],
+            "hover": theme['highlight'],
+            "selected": theme['highlight'],
+            "selected_text": theme['text'],
+            "scroll_background": theme['background'],
+        }
+
+    def compile(self, theme):
+        if theme == "custom":
+            custom_theme = self.custom_theme
+            key = ("custom", tuple(sorted(custom_theme.items())))
+        else:
+            key = (theme, None)
+
+        compiled = self._compiled.get(key)
+        if compiled is None:
+            if theme == "custom":
+                colors = self.colors_from_custom_theme(custom_theme)
+            else:
+                colors = THEME_COLORS[theme]
+            compiled = THEME_STYLESHEET_TEMPLATE.format(**colors)
+            self._compiled[key] = compiled
+        return compiled
+
+    def resolve_theme(self, theme):
+        if theme == "custom" and self.custom_theme is None:
+            return "light"
+        if theme not in THEME_COLORS and theme != "custom":
+            return "light"
+        return theme
+
+    def apply(self, theme):
+        theme = self.resolve_theme(theme)
+        stylesheet = self.compile(theme)
+
+        # A stíluslap minden színt beállít, ezért palettát nem állítunk: az egy második, teljes
+        # PaletteChange kört indítana. Csak változáskor nyúlunk az alkalmazáshoz, így egyetlen repolish fut le.
+        app = QApplication.instance()
+        if app.styleSheet() != stylesheet:
+            app.setStyleSheet(stylesheet)
+
+        if theme != self.current_theme:
+            self.current_theme = theme
+            self.save_settings(theme=theme)
+        return theme
+
+    @property
+    def custom_theme(self):
+        if not self._custom_theme_loaded:
+            self._custom_theme = self.load_custom_theme()
+            self._custom_theme_loaded = True
+        return self._custom_theme
+
+    def load_custom_theme(self):
+        try:
+            theme = json.loads(self.settings.value("custom_theme", "") or "null")
+        except json.JSONDecodeError:
+            theme = None
+
+        migrated = False
+        if theme is None:
+            # Régebbi verziók csak a custom_theme.json fájlba mentettek; ezt már csak olvassuk
+            try:
+                with open('custom_theme.json', 'r') as f:
+                    theme = json.load(f)
+                migrated = True
+            except OSError:
+                print("Custom theme file not found. Using default theme.")
+                return None
+            except json.JSONDecodeError:
+                print("Invalid JSON in custom theme file. Using default theme.")
+                return None
+
+        # Ellenőrizzük, hogy minden szükséges kulcs megvan-e
+        if isinstance(theme, dict) and all(key in theme for key in CUSTOM_THEME_KEYS):
+            if migrated:
+                self.save_settings(custom_theme=json.dumps(theme))
+            return theme
+        print("Custom theme file is missing required keys. Using default theme.")
+        return None
+
+    def save_custom_theme(self, theme):
+        self._compiled = {key: value for key, value in self._compiled.items() if key[0] != "custom"}
+        self._custom_theme = theme
+        self._custom_theme_loaded = True
+        self.save_settings(custom_theme=json.dumps(theme))
+
+    def save_settings(self, **values):
+        # A beállításokat összegyűjtjük és késleltetve, egyben írjuk ki
+        self._pending_settings.update(values)
+        self._flush_timer.start()
+
+    def flush_settings(self):
+        self._flush_timer.stop()
+        if not self._pending_settings:
+            return
+        for key, value in self._pending_settings.items():
+            self.settings.setValue(key, value)
+        self._pending_settings.clear()
+
+
+_theme_engine = None
+
+
+def get_theme_engine(settings=None):
+    global _theme_engine
+    if _theme_engine is None:
+        _theme_engine = ThemeEngine(settings)
+        QApplication.instance().aboutToQuit.connect(_theme_engine.flush_settings)
+    return _theme_engine
+
 
 class ThemeSelector(QWidget):
     def __init__(self, parent=None):
@@ -248,138 +1020,32 @@ class ThemeSelector(QWidget):
         self.dark_button.clicked.connect(lambda: self.set_theme("dark"))
         self.custom_button.clicked.connect(self.open_custom_theme_dialog)
 
-        self.settings = QSettings("WarframeInfoHub", "ThemeSettings")
+        self.theme_engine = get_theme_engine()
         self.load_theme()
 
     def set_theme(self, theme):
-        if theme == "light":
-            stylesheet = """
-                QWidget { background-color: #ffffff; color: #000000; }
-                QPushButton { background-color: #e0e0e0; border: 1px solid #b0b0b0; padding: 5px; }
-                QTreeWidget { 
-                    border: 1px solid #d0d0d0;
-                    background-color: #f0f0f0;
-                    color: #333333;
-                }
-                QTreeWidget::item { 
-                    padding: 5px;
-                    border-bottom: 1px solid #e0e0e0;
-                }
-                QTreeWidget::item:selected { 
-                    background-color: #a0a0a0;
-                    color: #ffffff;
-                }
-                QScrollArea { background-color: #f0f0f0; }
-                QWebEngineView { background-color: #ffffff; }
-            """
-        elif theme == "dark":
-            stylesheet = """
-                QWidget { background-color: #2b2b2b; color: #ffffff; }
-                QPushButton { background-color: #3b3b3b; border: 1px solid #505050; padding: 5px; }
-                QTreeWidget { 
-                    border: 1px solid #505050;
-                    background-color: #1b1b1b;
-                    color: #e0e0e0;
-                }
-                QTreeWidget::item { 
-                    padding: 5px;
-                    border-bottom: 1px solid #3b3b3b;
-                }
-                QTreeWidget::item:selected { 
-                    background-color: #505050;
-                    color: #ffffff;
-                }
-                QScrollArea { background-color: #1b1b1b; }
-                QWebEngineView { background-color: #2b2b2b; }
-            """
-        else:  # custom theme
-            custom_theme = self.load_custom_theme()
-            if custom_theme:
-                stylesheet = self.create_stylesheet_from_theme(custom_theme)
-            else:
-                stylesheet = """
-                    /* ... (light téma stílus) ... */
-                """
-                theme = "light"
-
-        QApplication.instance().setStyleSheet(stylesheet)
-        self.settings.setValue("theme", theme)
-        self.settings.setValue("stylesheet", stylesheet)
-        if theme == "custom" and custom_theme:
-            self.settings.setValue("custom_theme", json.dumps(custom_theme))
-        else:
-            self.settings.remove("custom_theme")
-        self.settings.sync()  # Azonnal mentsük a beállításokat
+        theme = self.theme_engine.apply(theme)
 
         # Frissítjük a WebEngineView tartalmát és a felhasználói felületet
         main_window = self.window()  # Get the main window
         if hasattr(main_window, 'current_theme'):
             main_window.current_theme = theme
         if hasattr(main_window, 'custom_theme'):
-            main_window.custom_theme = custom_theme if theme == "custom" else None
+            main_window.custom_theme = self.theme_engine.custom_theme if theme == "custom" else None
         if hasattr(main_window, 'refresh_ui'):
             main_window.refresh_ui()
+
     def load_theme(self):
-        theme = self.settings.value("theme", "light")
-        stylesheet = self.settings.value("stylesheet", "")
-        if stylesheet:
-            QApplication.instance().setStyleSheet(stylesheet)
-        else:
-            self.set_theme(theme)
+        theme = self.theme_engine.settings.value("theme", "light")
+        self.theme_engine.apply(theme)
 
     def open_custom_theme_dialog(self):
         dialog = CustomThemeDialog(self)
         if dialog.exec_():
             custom_theme = dialog.get_theme()
-            self.save_custom_theme(custom_theme)
+            self.theme_engine.save_custom_theme(custom_theme)
             self.set_theme("custom")
 
-    def save_custom_theme(self, theme):
-        with open('custom_theme.json', 'w') as f:
-            json.dump(theme, f)
-
-    def load_custom_theme(self):
-        try:
-            with open('custom_theme.json', 'r') as f:
-                theme = json.load(f)
-            # Ellenőrizzük, hogy minden szükséges kulcs megvan-e
-            required_keys = ['background', 'text', 'button', 'border', 'highlight']
-            if all(key in theme for key in required_keys):
-                return theme
-            else:
-                print("Custom theme file is missing required keys. Using default theme.")
-                return None
-        except FileNotFoundError:
-            print("Custom theme file not found. Using default theme.")
-            return None
-        except json.JSONDecodeError:
-            print("Invalid JSON in custom theme file. Using default theme.")
-            return None
-
-    def create_stylesheet_from_theme(self, theme):
-        return f"""
-            QWidget {{ background-color: {theme['background']}; color: {theme['text']}; }}
-            QPushButton {{ background-color: {theme['button']}; border: 1px solid {theme['border']}; padding: 5px; }}
-            QTreeWidget {{ 
-                border: none;
-                background-color: {theme['background']};
-                color: {theme['text']};
-            }}
-            QTreeWidget::item {{ 
-                padding: 10px;
-                border-bottom: 1px solid {theme['border']};
-            }}
-            QTreeWidget::item:hover {{
-                background-color: {theme['highlight']};
-            }}
-            QTreeWidget::item:selected {{ 
-                background-color: {theme['highlight']};
-                color: {theme['text']};
-            }}
-            QScrollArea {{ background-color: {theme['background']}; }}
-            QWebEngineView {{ background-color: {theme['background']}; }}
-        """
-
 
 class CustomThemeDialog(QDialog):
     def __init__(self, parent=None):
@@ -424,29 +1090,21 @@ class CustomThemeDialog(QDialog):
 
 class GitHubMainWindow(QMainWindow):
     GITHUB_RAW_URL = "https://raw.githubusercontent.com/LexyGuru/Warframe_Api_Main/main/"
+    THEME_STYLE_ELEMENT_ID = "wfih-theme-style"
 
-    def __init__(self, debug=False):
+    def __init__(self, debug=False, isolated=False):
         super().__init__()
         self.debug = debug
         self.platform_settings = get_platform_specific_settings()
-        self.settings = QSettings("WarframeInfoHub", "ThemeSettings")
-        self.current_theme = self.settings.value("theme", "light")
+        self.theme_engine = get_theme_engine()
+        self.settings = self.theme_engine.settings
         self.current_page = "home"  # Alapértelmezett oldal
 
-        custom_theme_str = self.settings.value("custom_theme", "{}")
-        try:
-            self.custom_theme = json.loads(custom_theme_str)
-        except json.JSONDecodeError:
-            self.custom_theme = None
+        # A stíluslapot az initialize_application már alkalmazta, itt csak a lefordított téma kell
+        self.current_theme = self.theme_engine.apply(self.settings.value("theme", "light"))
+        self.custom_theme = self.theme_engine.custom_theme if self.current_theme == "custom" else None
 
-        # Az alapértelmezett stíluslap beállítása az alkalmazás szintjén
         app = QApplication.instance()
-        stylesheet = self.settings.value("stylesheet", "")
-        if stylesheet:
-            app.setStyleSheet(stylesheet)
-        else:
-            app.setStyleSheet(self.platform_settings['stylesheet'])
-
         app_font = QFont(self.platform_settings['font_family'], self.platform_settings['font_size'])
         app.setFont(app_font)
 
@@ -454,6 +1112,7 @@ class GitHubMainWindow(QMainWindow):
         self.setGeometry(100, 100, 1200, 800)
         self.setMinimumSize(800, 600)
         self.web_bridge = WebBridge()
+        self.page_lifecycle = PageLifecycleManager(self)
         self.channel = QWebChannel()
         self.channel.registerObject('pyotherside', self.web_bridge)
 
@@ -463,10 +1122,26 @@ class GitHubMainWindow(QMainWindow):
         if not os.path.exists(self.cache_dir):
             os.makedirs(self.cache_dir)
 
+        # Friss telepítésnél a csomagba épített pillanatkép alapján hálózat nélkül is megjelennek az oldalak.
+        # Izolált futásnál (soak teszt) csak a beállított kliens tartalmát használjuk, háttérfolyamatok nélkül.
+        self.data_client = get_data_client()
+        self.data_client.local_root = get_bundle_directory()
+        if not isolated:
+            self.data_client.seed_from_bundle(get_bundle_directory())
+            self.content_updater = threading.Thread(target=self.data_client.update_content, name="ContentUpdater",
+                                                    daemon=True)
+            self.content_updater.start()
+
         self.menu_layout = QVBoxLayout()
         self.theme_selector = ThemeSelector(self)
         self.menu_layout.addWidget(self.theme_selector)
 
+        self.debug_panel = None
+        if self.debug:
+            self.debug_button = QPushButton("Debug panel")
+            self.debug_button.clicked.connect(self.show_debug_panel)
+            self.menu_layout.addWidget(self.debug_button)
+
         if self.debug:
             print(f"Operating System: {platform.system()} {platform.release()}")
             print(f"Python version: {sys.version}")
@@ -478,6 +1153,17 @@ class GitHubMainWindow(QMainWindow):
 
         self.setup_ui()
 
+        # A figyelési szabályok a weboldalaktól függetlenül, a háttérben futnak
+        self.alert_notifier = AlertNotifier(self)
+        self.worldstate_history = WorldstateHistory(os.path.join(self.cache_dir, 'history'))
+        self.web_bridge.history = self.worldstate_history
+        self.worldstate_monitor = WorldstateMonitor(self.data_client, self.worldstate_history, self)
+        self.worldstate_monitor.alert_triggered.connect(self.alert_notifier.notify)
+        QApplication.instance().aboutToQuit.connect(self.worldstate_monitor.stop)
+        QApplication.instance().aboutToQuit.connect(self.worldstate_history.close)
+        if not isolated:
+            self.worldstate_monitor.start()
+
     def setup_ui(self):
         central_widget = QWidget()
         self.setCentralWidget(central_widget)
@@ -509,7 +1195,6 @@ class GitHubMainWindow(QMainWindow):
         self.tree = QTreeWidget()
         self.tree.setHeaderHidden(True)
         self.tree.setFont(QFont("Arial", 13))
-        self.update_tree_style()
 
         menu_structure = [
             ("Kezdőlap", self.load_home_page),
@@ -552,9 +1237,15 @@ class GitHubMainWindow(QMainWindow):
 
     def create_web_view(self):
         web_view = QWebEngineView()
-        page = CustomWebEnginePage(self)
+        profile = get_web_profile()
+        if profile is not None:
+            page = CustomWebEnginePage(profile, self)
+            settings = profile.settings()
+        else:
+            page = CustomWebEnginePage(self)
+            settings = QWebEngineSettings.globalSettings()
         web_view.setPage(page)
-        settings = QWebEngineSettings.globalSettings()
+        self.page_lifecycle.register(page)
 
         settings.setAttribute(QWebEngineSettings.LocalContentCanAccessRemoteUrls, True)
         settings.setAttribute(QWebEngineSettings.JavascriptEnabled, True)
@@ -564,102 +1255,28 @@ class GitHubMainWindow(QMainWindow):
 
         return web_view
 
-    def update_tree_style(self):
-        theme = self.current_theme
-        if theme == "light":
-            tree_style = """
-                QTreeWidget {
-                    border: none;
-                    background-color: #f0f0f0;
-                    color: #333333;
-                }
-                QTreeWidget::item { 
-                    padding: 10px;
-                    border-bottom: 1px solid #e0e0e0;
-                }
-                QTreeWidget::item:hover {
-                    background-color: #e0e0e0;
-                }
-                QTreeWidget::item:selected { 
-                    background-color: #a0a0a0;
-                    color: #ffffff;
-                }
-            """
-        elif theme == "dark":
-            tree_style = """
-                QTreeWidget {
-                    border: none;
-                    background-color: #2b2b2b;
-                    color: #ffffff;
-                }
-                QTreeWidget::item { 
-                    padding: 10px;
-                    border-bottom: 1px solid #3b3b3b;
-                }
-                QTreeWidget::item:hover {
-                    background-color: #3b3b3b;
-                }
-                QTreeWidget::item:selected { 
-                    background-color: #505050;
-                    color: #ffffff;
-                }
-            """
-        else:  # custom theme
-            if isinstance(self.custom_theme, dict) and all(key in self.custom_theme for key in ['background', 'text', 'border', 'highlight']):
-                tree_style = f"""
-                    QTreeWidget {{
-                        border: none;
-                        background-color: {self.custom_theme['background']};
-                        color: {self.custom_theme['text']};
-                    }}
-                    QTreeWidget::item {{ 
-                        padding: 10px;
-                        border-bottom: 1px solid {self.custom_theme['border']};
-                    }}
-                    QTreeWidget::item:hover {{
-                        background-color: {self.custom_theme['highlight']};
-                    }}
-                    QTreeWidget::item:selected {{ 
-                        background-color: {self.custom_theme['highlight']};
-                        color: {self.custom_theme['text']};
-                    }}
-                """
-            else:
-                # Fallback to light theme if custom theme is not set correctly
-                tree_style = """
-                    QTreeWidget {
-                        border: none;
-                        background-color: #f0f0f0;
-                        color: #333333;
-                    }
-                    QTreeWidget::item { 
-                        padding: 10px;
-                        border-bottom: 1px solid #e0e0e0;
-                    }
-                    QTreeWidget::item:hover {
-                        background-color: #e0e0e0;
-                    }
-                    QTreeWidget::item:selected { 
-                        background-color: #a0a0a0;
-                        color: #ffffff;
-                    }
-                """
-        self.tree.setStyleSheet(tree_style)
+    def show_debug_panel(self):
+        if self.debug_panel is None:
+            self.debug_panel = DebugPanel(self, self)
+        self.debug_panel.show()
+        self.debug_panel.raise_()
 
     def refresh_ui(self):
-        self.update_tree_style()
-        if self.current_page == "home":
-            self.load_home_page()
-        else:
-            self.load_page(self.current_page)
+        # A fa stílusa a lefordított témában van, így elég a webes tartalmat frissíteni
         self.update_web_content_theme(self.current_theme)
 
     def update_web_content_theme(self, theme):
         self.current_theme = theme
+        # Egyetlen, azonosítóval ellátott style elemet használunk újra, hogy a témaváltások ne halmozzák a node-okat
         js_code = f"""
         (function() {{
-            var style = document.createElement('style');
-            style.type = 'text/css';
+            var style = document.getElementById('{self.THEME_STYLE_ELEMENT_ID}');
+            if (!style) {{
+                style = document.createElement('style');
+                style.id = '{self.THEME_STYLE_ELEMENT_ID}';
+                style.type = 'text/css';
+                document.head.appendChild(style);
+            }}
             style.innerHTML = `
                 body {{ 
                     background-color: {('#ffffff' if theme == 'light' else '#2b2b2b')};
@@ -671,7 +1288,6 @@ class GitHubMainWindow(QMainWindow):
                     border-color: {('#d0d0d0' if theme == 'light' else '#505050')};
                 }}
             `;
-            document.head.appendChild(style);
         }})();
         """
         self.web_view.page().runJavaScript(js_code)
@@ -705,6 +1321,7 @@ class GitHubMainWindow(QMainWindow):
                 raise Exception("Failed to download README.md")
 
             html_content = markdown.markdown(readme_content, extensions=['extra', 'codehilite'])
+            html_content = route_images_through_cache(html_content, self.devicePixelRatioF())
 
             css_content = """
                 body {
@@ -863,18 +1480,11 @@ class GitHubMainWindow(QMainWindow):
 
     @staticmethod
     def download_file(filename):
-        url = GitHubMainWindow.GITHUB_RAW_URL + filename
-        try:
-            response = requests.get(url, timeout=10, verify=True)
-            response.raise_for_status()
-            logging.debug(f"Successfully downloaded {filename}")
-            return response.text
-        except requests.exceptions.RequestException as e:
-            logging.error(f"Error downloading file {filename}: {str(e)}")
-            return None
+        return get_data_client().get_asset(filename)
 
 
-def initialize_application():
+def initialize_application(theme_settings=None):
+    # A theme_settings egy külön QSettings a téma tárolására (a soak teszt így nem írja a felhasználóét)
     logging.info("Initializing application")
     QCoreApplication.setAttribute(Qt.AA_ShareOpenGLContexts)
     QCoreApplication.setAttribute(Qt.AA_UseHighDpiPixmaps)
@@ -882,46 +1492,10 @@ def initialize_application():
     app = QApplication(sys.argv)
 
     # Alapértelmezett téma betöltése
-    settings = QSettings("WarframeInfoHub", "ThemeSettings")
-    theme = settings.value("theme", "light")
-    stylesheet = settings.value("stylesheet", "")
-
-    if not stylesheet:
-        # Ha nincs mentett stíluslap, állítsunk be egy alapértelmezettet
-        default_stylesheet = """
-            QWidget { background-color: #ffffff; color: #000000; }
-            QPushButton { background-color: #e0e0e0; border: 1px solid #b0b0b0; padding: 5px; }
-            QTreeWidget {
-                border: 1px solid #d0d0d0;
-                background-color: #f0f0f0;
-                color: #333333;
-            }
-            QTreeWidget::item {
-                padding: 5px;
-                border-bottom: 1px solid #e0e0e0;
-            }
-            QTreeWidget::item:selected {
-                background-color: #a0a0a0;
-                color: #ffffff;
-            }
-            QScrollArea { background-color: #f0f0f0; }
-            QWebEngineView { background-color: #ffffff; }
-        """
-        stylesheet = default_stylesheet
-        settings.setValue("stylesheet", default_stylesheet)
-        settings.setValue("theme", "light")
-        settings.sync()
-
-    app.setStyleSheet(stylesheet)
+    theme_engine = get_theme_engine(theme_settings)
+    theme_engine.apply(theme_engine.settings.value("theme", "light"))
 
-    if QWebEngineProfile is not None:
-        profile = QWebEngineProfile.defaultProfile()
-        profile.setPersistentCookiesPolicy(QWebEngineProfile.NoPersistentCookies)
-
-        profile.setHttpUserAgent(
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/91.0.4472.124 Safari/537.36")
+    get_web_profile()
 
     logging.info("Application initialized successfully")
     return app
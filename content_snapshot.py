@@ -0,0 +1,197 @@
+# Copyright (c) 2024 LexyGuru
+# This file is part of the API_Warframe_Cross_GUI project, licensed under the MIT License.
+# For the full license text, see the LICENSE file in the project root.
+
+# Tartalom-pillanatkép: a gui/ könyvtár, a README.md és a CDN-es szkriptek egyetlen indexelt archívumban.
+# A fagyasztott (PyInstaller) csomagba kerül, futás közben csak olvasásra, mmap-pel nyitjuk meg.
+#
+# Készítés:  python content_snapshot.py build -o content_snapshot.wfs [--source <Warframe_Api_Main checkout>]
+# PyInstaller: --add-data "content_snapshot.wfs:."
+
+import argparse
+import hashlib
+import json
+import logging
+import mmap
+import os
+import struct
+import sys
+import time
+
+SNAPSHOT_MAGIC = b"WFSNAP01"
+SNAPSHOT_HEADER = struct.Struct("<8sQ")
+SNAPSHOT_FILENAME = "content_snapshot.wfs"
+
+GITHUB_REPO = "LexyGuru/Warframe_Api_Main"
+GITHUB_BRANCH = "main"
+GITHUB_RAW_URL = f"https://raw.githubusercontent.com/{GITHUB_REPO}/{GITHUB_BRANCH}/"
+GITHUB_TREE_API_URL = f"https://api.github.com/repos/{GITHUB_REPO}/git/trees/{GITHUB_BRANCH}?recursive=1"
+GITHUB_COMMIT_API_URL = f"https://api.github.com/repos/{GITHUB_REPO}/commits/{GITHUB_BRANCH}"
+
+# Külső CDN-ről betöltött szkriptek: a pillanatképbe is bekerülnek, és a helyi cache-ből szolgáljuk ki őket,
+# így az első indítás hálózat nélkül is teljes. Nem a GitHub fa részei, az update_content nem törli őket.
+VENDOR_ASSETS = {
+    "https://code.jquery.com/jquery-3.6.0.min.js": "vendor/jquery-3.6.0.min.js",
+}
+
+
+def is_snapshot_content(path):
+    return path == "README.md" or path.startswith("gui/")
+
+
+def git_blob_sha(data):
+    # Ugyanaz az azonosító, amit a GitHub tree API ad, így a változásokat letöltés nélkül látjuk
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+class ContentSnapshot:
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, index_length = SNAPSHOT_HEADER.unpack_from(self._map, 0)
+            if magic != SNAPSHOT_MAGIC:
+                raise ValueError(f"{path} is not a content snapshot")
+            index_start = SNAPSHOT_HEADER.size
+            index = json.loads(self._map[index_start:index_start + index_length].decode('utf-8'))
+        except Exception:
+            self.close()
+            raise
+        self._data_start = index_start + index_length
+        self.version = index.get('version')
+        self.created = index.get('created')
+        self.files = index['files']
+
+    def read(self, name):
+        entry = self.files.get(name)
+        if entry is None:
+            return None
+        start = self._data_start + entry['offset']
+        return self._map[start:start + entry['size']]
+
+    def close(self):
+        if getattr(self, '_map', None) is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def open_bundled_snapshot(bundle_dir):
+    path = os.path.join(bundle_dir, SNAPSHOT_FILENAME)
+    if not os.path.exists(path):
+        return None
+    try:
+        return ContentSnapshot(path)
+    except (OSError, ValueError) as e:
+        logging.error(f"Error opening content snapshot {path}: {str(e)}")
+        return None
+
+
+def write_snapshot(output_path, files, version):
+    index = {'version': version, 'created': int(time.time()), 'files': {}}
+    offset = 0
+    for name in sorted(files):
+        data = files[name]
+        index['files'][name] = {'offset': offset, 'size': len(data), 'sha': git_blob_sha(data)}
+        offset += len(data)
+
+    index_bytes = json.dumps(index, separators=(',', ':')).encode('utf-8')
+    temp_path = output_path + '.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, len(index_bytes)))
+        f.write(index_bytes)
+        for name in sorted(files):
+            f.write(files[name])
+    os.replace(temp_path, output_path)
+    return index
+
+
+def collect_local_files(source_dir):
+    files = {}
+    for root, _, names in os.walk(source_dir):
+        for name in names:
+            full_path = os.path.join(root, name)
+            relative = os.path.relpath(full_path, source_dir).replace(os.sep, '/')
+            if is_snapshot_content(relative):
+                with open(full_path, 'rb') as f:
+                    files[relative] = f.read()
+    return files
+
+
+def collect_vendor_files(session=None):
+    import requests
+
+    session = session or requests.Session()
+    files = {}
+    for url, name in VENDOR_ASSETS.items():
+        response = session.get(url, timeout=30)
+        response.raise_for_status()
+        files[name] = response.content
+        logging.info(f"Added {name} ({len(response.content)} bytes)")
+    return files
+
+
+def collect_remote_files():
+    import requests
+
+    session = requests.Session()
+    tree = session.get(GITHUB_TREE_API_URL, timeout=30)
+    tree.raise_for_status()
+    commit = session.get(GITHUB_COMMIT_API_URL, timeout=30)
+    commit.raise_for_status()
+
+    files = {}
+    for entry in tree.json().get('tree', []):
+        if entry.get('type') == 'blob' and is_snapshot_content(entry['path']):
+            response = session.get(GITHUB_RAW_URL + entry['path'], timeout=30)
+            response.raise_for_status()
+            files[entry['path']] = response.content
+            logging.info(f"Added {entry['path']} ({len(response.content)} bytes)")
+    files.update(collect_vendor_files(session))
+    return files, commit.json()['sha']
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Content snapshot builder")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build_parser = subparsers.add_parser('build', help='Build a snapshot of gui/, README.md and the vendor scripts')
+    build_parser.add_argument('-o', '--output', default=SNAPSHOT_FILENAME)
+    build_parser.add_argument('--source', help='Local Warframe_Api_Main checkout (default: download from GitHub)')
+    build_parser.add_argument('--version', help='Snapshot version (default: commit SHA or build time)')
+
+    list_parser = subparsers.add_parser('list', help='List the contents of a snapshot')
+    list_parser.add_argument('snapshot')
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    if args.command == 'build':
+        if args.source:
+            files = collect_local_files(args.source)
+            files.update(collect_vendor_files())
+            version = args.version or time.strftime('%Y%m%d%H%M%S')
+        else:
+            files, commit_sha = collect_remote_files()
+            version = args.version or commit_sha
+        index = write_snapshot(args.output, files, version)
+        logging.info(f"Wrote {args.output}: {len(index['files'])} files, version {version}")
+    else:
+        with ContentSnapshot(args.snapshot) as snapshot:
+            print(f"Version: {snapshot.version}")
+            for name, entry in sorted(snapshot.files.items()):
+                print(f"{entry['size']:>10}  {entry['sha']}  {name}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,187 @@
+# Copyright (c) 2024 LexyGuru
+# This file is part of the API_Warframe_Cross_GUI project, licensed under the MIT License.
+# For the full license text, see the LICENSE file in the project root.
+
+# Helyi HTTP végpont (127.0.0.1), amelyre a webes oldalak API hívásait átirányítjuk.
+# A válaszokat a WarframeDataClient cache-eli, így a JS felől érkező forgalom is
+# deduplikált és TTL szerint cache-elt, akárcsak a Python oldali letöltések.
+#
+#   /api/<host>/<path>?<query>  ->  https://<host>/<path>?<query>
+#   /img?url=<kép URL>&h=<magasság>  ->  a kép cache-elt, előre kicsinyített változata
+#   /vendor?url=<szkript URL>  ->  a VENDOR_ASSETS szkriptek cache-elt (pillanatképből töltött) másolata
+
+import logging
+import mimetypes
+import os
+import shutil
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+import requests
+
+from content_snapshot import VENDOR_ASSETS
+from warframe_data_client import PROXIED_API_HOSTS, PROXIED_IMAGE_HOSTS
+
+
+class LocalCacheRequestHandler(BaseHTTPRequestHandler):
+    server_version = "WarframeInfoHubCache/1.0"
+
+    def log_message(self, format, *args):
+        logging.debug(f"Local cache server: {format % args}")
+
+    def send_cors_headers(self):
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Allow-Methods', 'GET, OPTIONS')
+        self.send_header('Access-Control-Allow-Headers', '*')
+
+    def send_body(self, status, body, content_type):
+        self.send_response(status)
+        self.send_cors_headers()
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_file(self, path, content_type):
+        # A fájlt darabonként küldjük, a nagy válaszok sem kerülnek egészben a memóriába
+        try:
+            f = open(path, 'rb')
+        except OSError as e:
+            self.send_error_body(502, str(e))
+            return
+        with f:
+            self.send_response(200)
+            self.send_cors_headers()
+            self.send_header('Content-Type', content_type or 'application/octet-stream')
+            self.send_header('Content-Length', str(os.fstat(f.fileno()).st_size))
+            self.send_header('Cache-Control', 'no-store')
+            self.end_headers()
+            shutil.copyfileobj(f, self.wfile)
+
+    def count_request(self, name):
+        with self.server.stats_lock:
+            self.server.stats[name] += 1
+
+    def send_error_body(self, status, message):
+        self.send_body(status, message.encode('utf-8'), 'text/plain; charset=utf-8')
+
+    def do_OPTIONS(self):
+        self.send_response(204)
+        self.send_cors_headers()
+        self.end_headers()
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        route, _, rest = parts.path.lstrip('/').partition('/')
+        if route == 'api':
+            self.handle_api(rest, parts.query)
+        elif route == 'img':
+            self.handle_image(parse_qs(parts.query))
+        elif route == 'vendor':
+            self.handle_vendor(parse_qs(parts.query))
+        else:
+            self.send_error_body(404, "Unknown route")
+
+    def handle_api(self, rest, query):
+        host, _, path = rest.partition('/')
+        if host not in PROXIED_API_HOSTS:
+            self.send_error_body(403, f"Host {host} is not proxied")
+            return
+
+        url = f"https://{host}/{path}" + (f"?{query}" if query else "")
+        self.count_request('api_requests')
+        try:
+            path, content_type = self.server.client.get_response_path(url)
+        except requests.exceptions.HTTPError as e:
+            status = e.response.status_code if e.response is not None else 502
+            self.send_error_body(status, str(e))
+            return
+        except requests.exceptions.RequestException as e:
+            self.send_error_body(502, str(e))
+            return
+        self.send_file(path, content_type)
+
+    def handle_image(self, params):
+        url = params.get('url', [''])[0]
+        if urlsplit(url).hostname not in PROXIED_IMAGE_HOSTS:
+            self.send_error_body(403, "Image host is not proxied")
+            return
+        try:
+            height = int(params.get('h', ['0'])[0])
+        except ValueError:
+            height = 0
+
+        self.count_request('image_requests')
+        try:
+            if height and self.server.image_provider is not None:
+                path, content_type = self.server.image_provider(url, height)
+            else:
+                path = self.server.client.get_image(url)
+                content_type = mimetypes.guess_type(url.split('?', 1)[0])[0]
+        except requests.exceptions.HTTPError as e:
+            status = e.response.status_code if e.response is not None else 502
+            self.send_error_body(status, str(e))
+            return
+        except (requests.exceptions.RequestException, OSError, ValueError) as e:
+            self.send_error_body(502, str(e))
+            return
+        self.send_file(path, content_type)
+
+
+    def handle_vendor(self, params):
+        url = params.get('url', [''])[0]
+        if url not in VENDOR_ASSETS:
+            self.send_error_body(403, "Script is not vendored")
+            return
+        try:
+            path = self.server.client.get_vendor_asset(url)
+        except requests.exceptions.HTTPError as e:
+            status = e.response.status_code if e.response is not None else 502
+            self.send_error_body(status, str(e))
+            return
+        except (requests.exceptions.RequestException, OSError, ValueError) as e:
+            self.send_error_body(502, str(e))
+            return
+        self.send_file(path, 'application/javascript; charset=utf-8')
+
+
+class LocalCacheServer:
+    def __init__(self, client, host='127.0.0.1', port=0, image_provider=None):
+        # Az image_provider(url, height) -> (útvonal, content_type) állítja elő a kicsinyített képeket
+        self.httpd = ThreadingHTTPServer((host, port), LocalCacheRequestHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.client = client
+        self.httpd.image_provider = image_provider
+        self.httpd.stats = {'api_requests': 0, 'image_requests': 0}
+        self.httpd.stats_lock = threading.Lock()
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name="LocalCacheServer", daemon=True)
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def stats(self):
+        with self.httpd.stats_lock:
+            return dict(self.httpd.stats)
+
+    def api_url(self, host, path, query=''):
+        return f"{self.base_url}/api/{host}{path}" + (f"?{query}" if query else "")
+
+    def image_url(self, url, height=None):
+        query = urlencode({'url': url, 'h': height} if height else {'url': url})
+        return f"{self.base_url}/img?{query}"
+
+    def vendor_url(self, url):
+        return f"{self.base_url}/vendor?{urlencode({'url': url})}"
+
+    def start(self):
+        self.thread.start()
+        logging.info(f"Local cache server listening on {self.base_url}")
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
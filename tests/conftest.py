@@ -0,0 +1,77 @@
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+# A modulok a projekt gyökerében vannak, csomag nélkül
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class RangeRequestHandler(BaseHTTPRequestHandler):
+    # Statikus fájlok ETag-gel és Range/If-Range támogatással; a nem teljesíthető tartományra 416-ot ad.
+    # A header_delays[path] listából kérésenként egy késleltetés jön a fejlécek előtt,
+    # a body_delays[path] a törzs közepén tart szünetet.
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        files = self.server.files
+        path = self.path.lstrip('/')
+        with self.server.lock:
+            self.server.requests.append((path, self.headers.get('Range')))
+        if path not in files:
+            self.send_error(404)
+            return
+
+        with self.server.lock:
+            delays = self.server.header_delays.get(path)
+            header_delay = delays.pop(0) if delays else 0
+        time.sleep(header_delay)
+
+        data = files[path]
+        etag = f'"{len(data)}-{hash(data) & 0xffffffff:x}"'
+        start = 0
+        range_header = self.headers.get('Range')
+        if range_header and self.headers.get('If-Range') in (None, etag):
+            start = int(range_header.split('=', 1)[1].split('-', 1)[0])
+            if start >= len(data):
+                self.send_response(416)
+                self.send_header('Content-Range', f'bytes */{len(data)}')
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            self.send_response(206)
+            self.send_header('Content-Range', f'bytes {start}-{len(data) - 1}/{len(data)}')
+        else:
+            self.send_response(200)
+        self.send_header('ETag', etag)
+        self.send_header('Content-Length', str(len(data) - start))
+        self.end_headers()
+        body = data[start:]
+        body_delay = self.server.body_delays.get(path)
+        if body_delay:
+            self.wfile.write(body[:len(body) // 2])
+            self.wfile.flush()
+            time.sleep(body_delay)
+            body = body[len(body) // 2:]
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def range_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), RangeRequestHandler)
+    server.daemon_threads = True
+    server.files = {}
+    server.requests = []
+    server.header_delays = {}
+    server.body_delays = {}
+    server.lock = threading.Lock()
+    server.base_url = f"http://127.0.0.1:{server.server_address[1]}/"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
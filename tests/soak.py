@@ -0,0 +1,227 @@
+# Hosszú futású soak teszt: sok oldalbetöltés, frissítés és témaváltás képernyő nélkül, a memória- és
+# objektumszám-növekedés mérésével. Nem pytest teszt, kézzel (vagy CI-ből) futtatandó:
+#
+#   python tests/soak.py --iterations 1000
+#
+# Minden cache útvonal, a témabeállítások és a tartalom egy ideiglenes könyvtárba kerül,
+# a felhasználó adataihoz és a hálózathoz nem nyúl.
+
+import argparse
+import functools
+import gc
+import http.server
+import importlib.util
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+from PyQt5.QtCore import QCoreApplication, QEventLoop, QObject, QSettings, QTimer
+from PyQt5.QtWebEngineWidgets import QWebEnginePage
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from warframe_data_client import CACHE_DIRECTORY_ENV, WarframeDataClient, set_data_client  # noqa: E402
+
+SOAK_PAGES = ["home", "search", "cycles", "sortie", "archon", "arbitration", "nightwave", "fissures", "baro",
+              "events", "info_git"]
+SOAK_THEMES = ["light", "dark"]
+SOAK_THEME_SWITCHES_PER_PAGE = 4
+
+
+class QuietRequestHandler(http.server.SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class SoakContentServer:
+    # Helyi helyettesítő a GitHub tartalomhoz, hogy a soak teszt hálózat nélkül, determinisztikusan fusson
+    def __init__(self, root):
+        self.root = root
+        self.write("README.md", "# Soak test\n\n" + "\n".join(f"- [{page}](#{page})" for page in SOAK_PAGES))
+        for page in SOAK_PAGES[1:]:
+            self.write(f"gui/{page}.html", f"<h1>{page}</h1>" + "".join(f"<p>{page} row {i}</p>" for i in range(200)))
+            self.write(f"gui/Script/{page}.js", f"console.log('{page} script loaded');")
+            self.write(f"gui/Styles/{page}_styles.css", "p { margin: 2px; }")
+
+        handler = functools.partial(QuietRequestHandler, directory=self.root)
+        self.httpd = http.server.ThreadingHTTPServer(('127.0.0.1', 0), handler)
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name="SoakContentServer", daemon=True)
+        self.thread.start()
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_address[1]}/"
+
+    def write(self, name, content):
+        path = os.path.join(self.root, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class SoakEnvironment:
+    # Minden cache útvonal (tartalom, képek, API, napló, WebEngine profil, történet) egy ideiglenes könyvtárba
+    # kerül; még azelőtt kell létrehozni, hogy bármi a get_data_client()-et vagy a get_cache_directory()-t hívná
+    def __init__(self):
+        self.root = tempfile.mkdtemp(prefix="wfih-soak-")
+        self.cache_dir = os.path.join(self.root, 'cache')
+        self.theme_settings_path = os.path.join(self.root, 'ThemeSettings.ini')
+        os.environ[CACHE_DIRECTORY_ENV] = self.cache_dir
+        self.content_server = SoakContentServer(os.path.join(self.root, 'content'))
+        set_data_client(WarframeDataClient(cache_dir=self.cache_dir, raw_url=self.content_server.base_url,
+                                           content_max_age=None))
+
+    def close(self):
+        self.content_server.close()
+        shutil.rmtree(self.root, ignore_errors=True)
+
+
+def load_app_module():
+    # A főprogram fájlneve nem érvényes modulnév, ezért útvonal alapján töltjük be
+    spec = importlib.util.spec_from_file_location("warframe_info_hub", os.path.join(ROOT, "WarframeInfoHub_V2.0.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def wait_for_signal(signal, timeout_ms):
+    loop = QEventLoop()
+    result = []
+
+    def on_signal(*args):
+        result.append(args)
+        loop.quit()
+
+    signal.connect(on_signal)
+    QTimer.singleShot(timeout_ms, loop.quit)
+    loop.exec_()
+    # Csak a saját slotunkat bontjuk, az alkalmazás többi kapcsolata marad
+    signal.disconnect(on_signal)
+    return result
+
+
+def run_javascript_sync(page, script, timeout_ms=5000):
+    loop = QEventLoop()
+    result = []
+
+    def on_result(value):
+        result.append(value)
+        loop.quit()
+
+    page.runJavaScript(script, on_result)
+    QTimer.singleShot(timeout_ms, loop.quit)
+    loop.exec_()
+    return result[0] if result else None
+
+
+def count_style_nodes(window):
+    return run_javascript_sync(window.web_view.page(), "document.querySelectorAll('style').length") or 0
+
+
+def sample_soak_metrics(app_module, window):
+    page = window.web_view.page()
+    live_objects = [obj for obj in gc.get_objects() if isinstance(obj, QObject)]
+    renderer_pid = page.renderProcessPid() if hasattr(page, 'renderProcessPid') else 0
+    return {
+        'python_rss_mb': app_module.get_process_memory_mb(os.getpid()) or 0.0,
+        'renderer_rss_mb': app_module.get_process_memory_mb(renderer_pid) or 0.0,
+        'web_pages': sum(1 for obj in live_objects if isinstance(obj, QWebEnginePage)),
+        'qobjects': len(live_objects),
+    }
+
+
+def run_soak_test(app_module, iterations, max_rss_growth_mb, max_qobject_growth, sample_every=50):
+    window = app_module.GitHubMainWindow(isolated=True)
+    window.show()
+    wait_for_signal(window.web_view.loadFinished, 10000)
+
+    samples = []
+    style_leaks = []
+    warmup = max(1, iterations // 10)
+    started = time.monotonic()
+    try:
+        for iteration in range(1, iterations + 1):
+            page_name = SOAK_PAGES[iteration % len(SOAK_PAGES)]
+            if page_name == "home":
+                window.load_home_page()
+            else:
+                window.load_page(page_name)
+            wait_for_signal(window.web_view.loadFinished, 10000)
+
+            # Ugyanazon a dokumentumon többször váltunk témát: a <style> node-ok száma nem nőhet
+            window.theme_selector.set_theme(SOAK_THEMES[0])
+            style_nodes = count_style_nodes(window)
+            for switch in range(1, SOAK_THEME_SWITCHES_PER_PAGE + 1):
+                window.theme_selector.set_theme(SOAK_THEMES[switch % len(SOAK_THEMES)])
+                window.refresh_ui()
+            style_growth = count_style_nodes(window) - style_nodes
+            if style_growth > 0:
+                style_leaks.append((iteration, page_name, style_growth))
+            QCoreApplication.processEvents()
+
+            if iteration == warmup or iteration % sample_every == 0 or iteration == iterations:
+                gc.collect()
+                sample = sample_soak_metrics(app_module, window)
+                sample['iteration'] = iteration
+                samples.append(sample)
+                logging.info(f"Soak {iteration}/{iterations}: {sample}")
+    finally:
+        window.close()
+
+    baseline = next(sample for sample in samples if sample['iteration'] >= warmup)
+    final = samples[-1]
+    failures = []
+    for key, limit in (('python_rss_mb', max_rss_growth_mb), ('renderer_rss_mb', max_rss_growth_mb),
+                       ('qobjects', max_qobject_growth), ('web_pages', 0)):
+        growth = final[key] - baseline[key]
+        if growth > limit:
+            failures.append(f"{key} grew by {growth:.1f} (limit {limit}): {baseline[key]} -> {final[key]}")
+    if style_leaks:
+        iteration, page_name, growth = style_leaks[0]
+        failures.append(f"style nodes grew on {len(style_leaks)} page(s) across {SOAK_THEME_SWITCHES_PER_PAGE} "
+                        f"theme switches (first: +{growth} on {page_name}, iteration {iteration})")
+
+    logging.info(f"Soak test finished: {iterations} iterations in {time.monotonic() - started:.1f} s")
+    for failure in failures:
+        logging.error(f"Soak test failure: {failure}")
+    if not failures:
+        logging.info("Soak test passed")
+    return 1 if failures else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offscreen soak test for Warframe Info Hub")
+    parser.add_argument('--iterations', type=int, default=1000, help='Number of page navigations')
+    parser.add_argument('--max-rss-growth-mb', type=float, default=100.0,
+                        help='Allowed RSS growth of the Python and renderer processes')
+    parser.add_argument('--max-qobject-growth', type=int, default=200,
+                        help='Allowed growth of live QObject instances')
+    args = parser.parse_args(argv)
+    if args.iterations < 1:
+        parser.error("--iterations must be positive")
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    # A soak teszt képernyő nélkül fut; a környezetet a Qt és a főprogram betöltése előtt állítjuk be
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    environment = SoakEnvironment()
+    try:
+        app_module = load_app_module()
+        app_module.GitHubMainWindow.GITHUB_RAW_URL = environment.content_server.base_url
+        app_module.setup_qt_resources()
+        # A témaváltások egy ideiglenes INI fájlba íródnak, nem a felhasználó beállításaiba
+        app = app_module.initialize_application(QSettings(environment.theme_settings_path, QSettings.IniFormat))
+        result = run_soak_test(app_module, args.iterations, args.max_rss_growth_mb, args.max_qobject_growth)
+        app.quit()
+        return result
+    finally:
+        environment.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
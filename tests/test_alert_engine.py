@@ -0,0 +1,112 @@
+from worldstate_alerts import AlertEngine, resolve_field
+
+AXI_FISSURE = {'id': 'fissure-1', 'tier': 'Axi', 'missionType': 'Survival', 'node': 'Olympus (Mars)', 'eta': '10m'}
+LITH_FISSURE = {'id': 'fissure-2', 'tier': 'Lith', 'missionType': 'Capture', 'node': 'Hepit (Void)', 'eta': '5m'}
+AXI_RULE = {'type': 'fissures', 'match': {'tier': 'Axi'}}
+
+
+def worldstate(*fissures, **extra):
+    return dict(extra, fissures=list(fissures))
+
+
+def test_new_matching_entity_fires_once():
+    engine = AlertEngine([AXI_RULE])
+    assert engine.evaluate(worldstate()) == []
+    alerts = engine.evaluate(worldstate(AXI_FISSURE, LITH_FISSURE))
+    assert [entity['id'] for _, entity in alerts] == ['fissure-1']
+    # Csak az illékony mezők változnak: nincs új jelzés
+    assert engine.evaluate(worldstate(dict(AXI_FISSURE, eta='9m'), LITH_FISSURE)) == []
+
+
+def test_match_is_case_insensitive_and_supports_lists_and_dotted_paths():
+    engine = AlertEngine([{'type': 'voidTrader', 'match': {'inventory.item': ['primed chamber']}}])
+    trader = {'id': 'baro', 'inventory': [{'item': 'Primed Chamber'}, {'item': 'Prisma Grakata'}]}
+    assert len(engine.evaluate({'voidTrader': trader})) == 1
+    assert resolve_field(trader, 'inventory.item') == ['Primed Chamber', 'Prisma Grakata']
+
+
+def test_all_conditions_must_match():
+    engine = AlertEngine([{'type': 'fissures', 'match': {'tier': 'Axi', 'missionType': 'Defense'}}])
+    assert engine.evaluate(worldstate(AXI_FISSURE)) == []
+
+
+def test_added_rule_sees_already_active_entities():
+    engine = AlertEngine([])
+    engine.evaluate(worldstate(AXI_FISSURE))
+    engine.set_rules([AXI_RULE])
+    assert [entity['id'] for _, entity in engine.evaluate(worldstate(AXI_FISSURE))] == ['fissure-1']
+    assert engine.evaluate(worldstate(AXI_FISSURE)) == []
+
+
+def test_edited_rule_is_reevaluated_against_current_state():
+    engine = AlertEngine([{'id': 'watch', 'type': 'fissures', 'match': {'tier': 'Lith'}}])
+    assert len(engine.evaluate(worldstate(AXI_FISSURE, LITH_FISSURE))) == 1
+    engine.set_rules([{'id': 'watch', 'type': 'fissures', 'match': {'tier': 'Axi'}}])
+    assert [entity['id'] for _, entity in engine.evaluate(worldstate(AXI_FISSURE, LITH_FISSURE))] == ['fissure-1']
+
+
+def test_rule_ids_do_not_depend_on_position():
+    other = {'type': 'sortie'}
+    engine = AlertEngine([AXI_RULE])
+    assert len(engine.evaluate(worldstate(AXI_FISSURE))) == 1
+    # Új szabály a lista elejére: a meglévő szabály azonosítója és jelzései megmaradnak
+    engine.set_rules([other, AXI_RULE])
+    assert engine.evaluate(worldstate(AXI_FISSURE)) == []
+    assert len({rule['id'] for rule in engine.rules}) == 2
+
+
+def test_fired_state_survives_restart():
+    engine = AlertEngine([AXI_RULE])
+    assert len(engine.evaluate(worldstate(AXI_FISSURE))) == 1
+
+    restarted = AlertEngine([AXI_RULE], fired=engine.fired_state())
+    assert restarted.evaluate(worldstate(AXI_FISSURE)) == []
+
+    # A leállás alatt felvett szabály a már aktív entitásra is jelez
+    lith_rule = {'type': 'fissures', 'match': {'tier': 'Lith'}}
+    restarted = AlertEngine([AXI_RULE, lith_rule], fired=engine.fired_state())
+    alerts = restarted.evaluate(worldstate(AXI_FISSURE, LITH_FISSURE))
+    assert [entity['id'] for _, entity in alerts] == ['fissure-2']
+
+
+def test_entity_that_returns_fires_again():
+    engine = AlertEngine([AXI_RULE])
+    assert len(engine.evaluate(worldstate(AXI_FISSURE))) == 1
+    engine.evaluate(worldstate())
+    assert len(engine.evaluate(worldstate(AXI_FISSURE))) == 1
+
+
+def test_describe_prefers_message():
+    assert AlertEngine.describe({'type': 'fissures', 'message': 'Axi!'}, AXI_FISSURE) == 'Axi!'
+    assert AlertEngine.describe(AXI_RULE, AXI_FISSURE) == 'fissures: Axi, Survival, Olympus (Mars)'
+
+
+def test_fired_state_survives_restart_when_rules_are_loaded_later():
+    # A WorldstateMonitor sorrendje: előbb a motor a mentett jelzésekkel, utána a szabályfájl
+    engine = AlertEngine([AXI_RULE])
+    assert len(engine.evaluate(worldstate(AXI_FISSURE))) == 1
+
+    restarted = AlertEngine(fired=engine.fired_state())
+    restarted.set_rules([AXI_RULE])
+    assert restarted.evaluate(worldstate(AXI_FISSURE)) == []
+
+
+def test_invalid_rules_are_skipped():
+    rules = [
+        'not a rule',
+        {'match': {'tier': 'Axi'}},
+        {'type': 'fissures', 'match': ['tier', 'Axi']},
+        {'type': 'fissures', 'match': {'tier': {'name': 'Axi'}}},
+        {'type': 'fissures', 'match': {'tier': [{'name': 'Axi'}]}},
+        {'type': 'fissures', 'match': {'tier': []}},
+        AXI_RULE,
+    ]
+    engine = AlertEngine(rules)
+    assert [rule['type'] for rule in engine.rules] == ['fissures']
+    assert len(engine.evaluate(worldstate(AXI_FISSURE))) == 1
+
+
+def test_malformed_fired_state_is_ignored():
+    engine = AlertEngine([AXI_RULE], fired=[['only', 'two'], 'text', None])
+    assert engine.fired == set()
+    assert len(engine.evaluate(worldstate(AXI_FISSURE))) == 1
@@ -0,0 +1,51 @@
+import json
+import os
+
+import requests
+
+from content_snapshot import git_blob_sha
+from warframe_data_client import ContentCache
+
+
+def test_fetch_resumes_partial_download(range_server, tmp_path):
+    data = os.urandom(200000)
+    range_server.files['gui/page.html'] = data
+    url = range_server.base_url + 'gui/page.html'
+    cache = ContentCache(str(tmp_path))
+    etag = requests.get(url).headers['ETag']
+
+    part_path = cache.path_for('gui/page.html') + '.part'
+    os.makedirs(os.path.dirname(part_path), exist_ok=True)
+    with open(part_path, 'wb') as f:
+        f.write(data[:50000])
+    with open(part_path + '.json', 'w', encoding='utf-8') as f:
+        json.dump({'url': url, 'etag': etag, 'last_modified': None}, f)
+
+    path = cache.fetch(url, 'gui/page.html', git_blob_sha(data))
+    with open(path, 'rb') as f:
+        assert f.read() == data
+    assert range_server.requests[-1] == ('gui/page.html', 'bytes=50000-')
+
+
+def test_fetch_restarts_when_part_is_already_complete(range_server, tmp_path):
+    # A folyamat az utolsó darab és az os.replace között állt le: a folytatásra a szerver 416-ot ad
+    data = os.urandom(100000)
+    range_server.files['gui/page.html'] = data
+    url = range_server.base_url + 'gui/page.html'
+    cache = ContentCache(str(tmp_path))
+    etag = requests.get(url).headers['ETag']
+
+    part_path = cache.path_for('gui/page.html') + '.part'
+    os.makedirs(os.path.dirname(part_path), exist_ok=True)
+    with open(part_path, 'wb') as f:
+        f.write(data)
+    with open(part_path + '.json', 'w', encoding='utf-8') as f:
+        json.dump({'url': url, 'etag': etag, 'last_modified': None}, f)
+
+    path = cache.fetch(url, 'gui/page.html', git_blob_sha(data))
+    with open(path, 'rb') as f:
+        assert f.read() == data
+    assert not os.path.exists(part_path)
+    assert not os.path.exists(part_path + '.json')
+    assert range_server.requests[-2:] == [('gui/page.html', 'bytes=100000-'), ('gui/page.html', None)]
+    assert cache.manifest['files']['gui/page.html'] == git_blob_sha(data)
@@ -0,0 +1,111 @@
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from content_snapshot import SNAPSHOT_FILENAME, VENDOR_ASSETS, git_blob_sha, write_snapshot
+from local_cache_server import LocalCacheServer
+from warframe_data_client import WarframeDataClient
+
+
+def test_concurrent_image_fetches(range_server, tmp_path):
+    # A README ikonjai egyszerre, a bélyegkép-készítő szálkészletéből érkeznek
+    images = {f"Icons/icon{number}.png": os.urandom(5000 + number) for number in range(16)}
+    range_server.files.update(images)
+    client = WarframeDataClient(cache_dir=str(tmp_path), raw_url=range_server.base_url)
+    urls = [range_server.base_url + name for name in images] * 2
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        paths = list(pool.map(client.get_image, urls))
+
+    for url, path in zip(urls, paths):
+        with open(path, 'rb') as f:
+            assert f.read() == images[url[len(range_server.base_url):]]
+    with open(client.image_cache.manifest_path, 'r', encoding='utf-8') as f:
+        assert len(json.load(f)['files']) == len(images)
+    assert not [name for name in os.listdir(client.image_cache.root) if name.endswith('.tmp')]
+
+
+def test_concurrent_asset_fetches(range_server, tmp_path):
+    pages = {f"gui/page{number}.html": f"<p>{number}</p>".encode('utf-8') for number in range(16)}
+    range_server.files.update(pages)
+    client = WarframeDataClient(cache_dir=str(tmp_path), raw_url=range_server.base_url)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        contents = list(pool.map(client.get_asset, pages))
+
+    assert contents == [data.decode('utf-8') for data in pages.values()]
+
+
+def serve_tree(range_server, files):
+    tree = [{'path': path, 'type': 'blob', 'sha': git_blob_sha(data), 'size': len(data)} for path, data in files.items()]
+    range_server.files.update(files)
+    range_server.files['tree'] = json.dumps({'tree': tree}).encode('utf-8')
+
+
+def test_stale_asset_is_refreshed_in_background(range_server, tmp_path):
+    serve_tree(range_server, {'README.md': b'# v1'})
+    client = WarframeDataClient(cache_dir=str(tmp_path), raw_url=range_server.base_url,
+                                tree_url=range_server.base_url + 'tree', content_max_age=60)
+    assert client.get_asset('README.md') == '# v1'
+    assert client.update_content() == 0
+
+    serve_tree(range_server, {'README.md': b'# v2'})
+    # Frissen ellenőrzött cache: nincs hálózati kérés
+    assert client.get_asset('README.md') == '# v1'
+    assert client.content_check_thread is None
+
+    client.last_content_check -= 61
+    assert client.get_asset('README.md') == '# v1'
+    client.content_check_thread.join(5)
+    assert client.get_asset('README.md') == '# v2'
+
+
+def test_content_check_can_be_disabled(range_server, tmp_path):
+    serve_tree(range_server, {'README.md': b'# v1'})
+    client = WarframeDataClient(cache_dir=str(tmp_path), raw_url=range_server.base_url,
+                                tree_url=range_server.base_url + 'tree', content_max_age=None)
+    assert client.get_asset('README.md') == '# v1'
+    client.last_content_check = 0
+    assert client.get_asset('README.md') == '# v1'
+    assert client.content_check_thread is None
+
+
+def test_api_response_is_cached_on_disk(range_server, tmp_path):
+    data = b'{"items": [' + b'1,' * 200000 + b'1]}'
+    range_server.files['api/items'] = data
+    client = WarframeDataClient(cache_dir=str(tmp_path), raw_url=range_server.base_url, content_max_age=None)
+    url = range_server.base_url + 'api/items'
+
+    path, _ = client.get_response_path(url, max_age=60)
+    with open(path, 'rb') as f:
+        assert f.read() == data
+    assert client.get_json(url, max_age=60) == json.loads(data)
+    assert [name for name, _ in range_server.requests].count('api/items') == 1
+    assert not [name for name in os.listdir(client.api_cache_dir) if name.endswith('.tmp')]
+
+
+def test_vendor_script_is_served_from_the_snapshot(range_server, tmp_path):
+    jquery_url, jquery_name = next(iter(VENDOR_ASSETS.items()))
+    jquery = b'/*! jQuery v3.6.0 */'
+    write_snapshot(str(tmp_path / SNAPSHOT_FILENAME), {'README.md': b'# v1', jquery_name: jquery}, 'v1')
+    serve_tree(range_server, {'README.md': b'# v1'})
+    client = WarframeDataClient(cache_dir=str(tmp_path / 'cache'), raw_url=range_server.base_url,
+                                tree_url=range_server.base_url + 'tree', content_max_age=None)
+    assert client.seed_from_bundle(str(tmp_path)) == 2
+
+    # A pillanatképből jön, a CDN-hez nem fordulunk; a GitHub fa alapú frissítés sem törli
+    assert client.update_content() == 0
+    with open(client.get_vendor_asset(jquery_url), 'rb') as f:
+        assert f.read() == jquery
+
+    server = LocalCacheServer(client)
+    server.start()
+    try:
+        response = requests.get(server.vendor_url(jquery_url))
+        assert response.status_code == 200
+        assert response.content == jquery
+        assert requests.get(server.vendor_url('https://example.com/evil.js')).status_code == 403
+    finally:
+        server.stop()
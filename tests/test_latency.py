@@ -0,0 +1,105 @@
+import time
+
+from warframe_data_client import DOWNLOAD_CHUNK_SIZE, HostLatencyTracker, WarframeDataClient, latency_endpoint
+
+
+def prime(tracker, endpoint, rtt, samples=HostLatencyTracker.MIN_HEDGE_SAMPLES):
+    for _ in range(samples):
+        tracker.observe_rtt(endpoint, rtt)
+
+
+def test_latency_endpoint_separates_paths():
+    assert latency_endpoint("https://api.warframestat.us/pc/?language=en") == "api.warframestat.us/pc"
+    assert latency_endpoint("https://api.warframestat.us/items/search/x") == "api.warframestat.us/items"
+
+
+def test_defaults_until_measured():
+    tracker = HostLatencyTracker()
+    assert tracker.timeouts("a/b") == HostLatencyTracker.DEFAULT_TIMEOUTS
+    assert tracker.hedge_delay("a/b") is None
+    assert tracker.concurrency("a/b") == HostLatencyTracker.CONCURRENCY_RANGE[0]
+
+
+def test_timeouts_follow_rtt_within_bounds():
+    tracker = HostLatencyTracker()
+    prime(tracker, "fast/x", 0.02)
+    connect, read = tracker.timeouts("fast/x")
+    assert connect == HostLatencyTracker.CONNECT_TIMEOUT_RANGE[0]
+    assert read == HostLatencyTracker.READ_TIMEOUT_RANGE[0]
+
+    prime(tracker, "slow/x", 30)
+    connect, read = tracker.timeouts("slow/x")
+    assert connect == HostLatencyTracker.CONNECT_TIMEOUT_RANGE[1]
+    assert read == HostLatencyTracker.READ_TIMEOUT_RANGE[1]
+
+
+def test_read_timeout_covers_slow_throughput():
+    tracker = HostLatencyTracker()
+    prime(tracker, "slow-link/x", 0.05)
+    # 16 KiB/s: egy 64 KiB-os darab 4 s, a read timeout ennek a többszöröse
+    tracker.observe_transfer("slow-link/x", 4 * DOWNLOAD_CHUNK_SIZE, 16)
+    assert tracker.timeouts("slow-link/x")[1] >= 4 * 4
+
+
+def test_timeout_widens_the_estimate():
+    tracker = HostLatencyTracker()
+    prime(tracker, "flaky/x", 0.5)
+    before = tracker.timeouts("flaky/x")[1]
+    tracker.observe_failure("flaky/x", timed_out=True)
+    assert tracker.timeouts("flaky/x")[1] > before
+    assert tracker.snapshot()["flaky/x"]['timeouts'] == 1
+
+
+def test_hedge_delay_needs_samples():
+    tracker = HostLatencyTracker()
+    prime(tracker, "a/x", 0.1, samples=HostLatencyTracker.MIN_HEDGE_SAMPLES - 1)
+    assert tracker.hedge_delay("a/x") is None
+    tracker.observe_rtt("a/x", 0.1)
+    assert 0.1 <= tracker.hedge_delay("a/x") <= 0.2
+
+
+def test_concurrency_grows_when_latency_dominates():
+    tracker = HostLatencyTracker()
+    prime(tracker, "small/x", 0.2)
+    tracker.observe_transfer("small/x", 1024 * 1024, 1.0)
+    assert tracker.concurrency("small/x") == HostLatencyTracker.CONCURRENCY_RANGE[0]
+
+    # 16 KiB-os fájlok 1 MiB/s mellett ~16 ms alatt jönnek le, a 200 ms-os válaszidőt párhuzamossággal töltjük ki
+    for _ in range(30):
+        tracker.observe_transfer("small/x", 16 * 1024, 0.016)
+    assert tracker.concurrency("small/x") == HostLatencyTracker.CONCURRENCY_RANGE[1]
+
+
+def make_client(range_server, tmp_path):
+    return WarframeDataClient(cache_dir=str(tmp_path), raw_url=range_server.base_url,
+                              tree_url=range_server.base_url + 'tree', content_max_age=None)
+
+
+def test_slow_headers_are_hedged(range_server, tmp_path):
+    range_server.files['api/slow'] = b'{"ok": true}'
+    range_server.header_delays['api/slow'] = [2.0]
+    client = make_client(range_server, tmp_path)
+    url = range_server.base_url + 'api/slow'
+    prime(client.latency, latency_endpoint(url), 0.01)
+
+    started = time.monotonic()
+    body, _ = client.get_response(url, max_age=0)
+    assert body == b'{"ok": true}'
+    assert time.monotonic() - started < 1.5
+    stats = client.latency.snapshot()[latency_endpoint(url)]
+    assert (stats['hedged'], stats['hedge_wins']) == (1, 1)
+
+
+def test_slow_body_is_not_hedged(range_server, tmp_path):
+    # Gyors fejlécek, lassú törzs (pl. /items): a törzset csak egyszer töltjük le
+    data = b'x' * (DOWNLOAD_CHUNK_SIZE * 4)
+    range_server.files['api/large'] = data
+    range_server.body_delays['api/large'] = 0.5
+    client = make_client(range_server, tmp_path)
+    url = range_server.base_url + 'api/large'
+    prime(client.latency, latency_endpoint(url), 0.01)
+
+    body, _ = client.get_response(url, max_age=0)
+    assert body == data
+    assert [path for path, _ in range_server.requests].count('api/large') == 1
+    assert client.latency.snapshot()[latency_endpoint(url)]['hedged'] == 0
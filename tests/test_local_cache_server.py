@@ -0,0 +1,77 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+from local_cache_server import LocalCacheServer
+
+
+class FileClient:
+    # A proxy csak a get_response_path-t és a get_image-et hívja: egy előre megírt fájlt ad vissza
+    def __init__(self, path):
+        self.path = path
+        self.urls = []
+
+    def get_response_path(self, url):
+        self.urls.append(url)
+        return self.path, 'application/json'
+
+    def get_image(self, url):
+        self.urls.append(url)
+        return self.path
+
+
+@pytest.fixture
+def cache_server(tmp_path):
+    body_path = tmp_path / 'items.body'
+    body_path.write_bytes(b'[' + b'{"name": "Excalibur"},' * 50000 + b'{}]')
+    server = LocalCacheServer(FileClient(str(body_path)))
+    server.start()
+    yield server
+    server.stop()
+
+
+def test_api_response_is_streamed_from_the_cached_file(cache_server):
+    response = requests.get(cache_server.api_url('api.warframestat.us', '/items/', 'language=en'))
+    assert response.status_code == 200
+    with open(cache_server.httpd.client.path, 'rb') as f:
+        assert response.content == f.read()
+    assert response.headers['Content-Length'] == str(os.path.getsize(cache_server.httpd.client.path))
+    assert response.headers['Access-Control-Allow-Origin'] == '*'
+    assert cache_server.httpd.client.urls == ['https://api.warframestat.us/items/?language=en']
+
+
+def test_unproxied_host_is_rejected(cache_server):
+    assert requests.get(cache_server.api_url('example.com', '/')).status_code == 403
+
+
+def test_request_counters_are_exact_under_concurrency(cache_server):
+    url = cache_server.api_url('api.warframestat.us', '/pc')
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        statuses = list(pool.map(lambda _: requests.get(url).status_code, range(64)))
+    assert statuses == [200] * 64
+    assert cache_server.stats['api_requests'] == 64
+
+
+def test_image_without_height_is_served_unscaled(tmp_path):
+    original = tmp_path / 'original.png'
+    original.write_bytes(b'original image')
+    thumbnail = tmp_path / 'thumbnail.png'
+    thumbnail.write_bytes(b'thumbnail')
+    rendered = []
+
+    def image_provider(url, height):
+        rendered.append((url, height))
+        return str(thumbnail), 'image/png'
+
+    server = LocalCacheServer(FileClient(str(original)), image_provider=image_provider)
+    server.start()
+    try:
+        url = 'https://cdn.warframestat.us/img/excalibur.png'
+        assert requests.get(server.image_url(url)).content == b'original image'
+        assert rendered == []
+        assert requests.get(server.image_url(url, 48)).content == b'thumbnail'
+        assert rendered == [(url, 48)]
+    finally:
+        server.stop()
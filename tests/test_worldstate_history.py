@@ -0,0 +1,114 @@
+import json
+import os
+
+import pytest
+
+from worldstate_history import WorldstateHistory
+
+
+def fissure(fissure_id, node, tier='Lith', eta='10m'):
+    return {'id': fissure_id, 'node': node, 'tier': tier, 'eta': eta}
+
+
+def worldstate(*fissures):
+    return {'fissures': list(fissures), 'sortie': {'id': 'sortie-1', 'boss': 'Vor'}}
+
+
+@pytest.fixture
+def history(tmp_path):
+    # Két lekérdezésenként egy blokk, így kevés adattal is több blokk keletkezik
+    history = WorldstateHistory(str(tmp_path))
+    history.SNAPSHOTS_PER_BLOCK = 2
+    return history
+
+
+def record_four_snapshots(history):
+    history.record(worldstate(fissure('f1', 'Hydron')), timestamp=100)
+    history.record(worldstate(fissure('f1', 'Hydron'), fissure('f2', 'Mot')), timestamp=200)
+    history.record(worldstate(fissure('f2', 'Mot'), fissure('f3', 'Hydron')), timestamp=300)
+    history.record(worldstate(fissure('f3', 'Hydron', tier='Neo')), timestamp=400)
+
+
+def test_only_changed_entities_are_recorded(history):
+    history.record(worldstate(fissure('f1', 'Hydron', eta='10m')), timestamp=100)
+    # Csak a volatilis mező változott: nincs új sor
+    history.record(worldstate(fissure('f1', 'Hydron', eta='9m')), timestamp=160)
+    assert [row['key'] for row in history.query('fissures')] == ['f1']
+    assert [row['ts'] for row in history.query('sortie')] == [100]
+
+
+def test_query_spans_blocks_and_pending_rows(history):
+    record_four_snapshots(history)
+    history.record(worldstate(fissure('f4', 'Cerberus')), timestamp=500)
+    assert len(history.index) == 2
+    assert len(history.pending) == 1
+
+    rows = history.query('fissures')
+    assert [(row['ts'], row['key']) for row in rows] == [(100, 'f1'), (200, 'f2'), (300, 'f3'), (400, 'f3'),
+                                                          (500, 'f4')]
+    assert rows[3]['entity']['tier'] == 'Neo'
+    assert history.query('fissures', fields=['tier'], limit=2) == [{'ts': 100, 'tier': 'Lith'},
+                                                                   {'ts': 200, 'tier': 'Lith'}]
+    assert history.count_by('fissures', 'node') == {'Hydron': 3, 'Mot': 1, 'Cerberus': 1}
+    assert history.count_by('fissures', 'tier') == {'Lith': 4, 'Neo': 1}
+
+    history.flush()
+    assert len(history.index) == 3
+    assert history.query('fissures') == rows
+
+
+def test_since_and_until_filter_blocks_that_straddle_the_range(history):
+    record_four_snapshots(history)
+    assert [(entry['t_min'], entry['t_max']) for entry in history.index] == [(100, 200), (300, 400)]
+
+    rows = history.query('fissures', since=150, until=350)
+    assert [(row['ts'], row['key']) for row in rows] == [(200, 'f2'), (300, 'f3')]
+    assert history.count_by('fissures', 'node', since=150, until=350) == {'Mot': 1, 'Hydron': 1}
+    assert history.count_by('fissures', 'tier', since=150, until=350) == {'Lith': 2}
+    # Az egész blokkot lefedő tartomány és a határokra eső időbélyegek
+    assert [row['ts'] for row in history.query('fissures', since=300)] == [300, 400]
+    assert [row['ts'] for row in history.query('fissures', until=100)] == [100]
+    assert history.query('fissures', since=250, until=280) == []
+    assert history.run_query({'type': 'fissures', 'since': 150, 'until': 350, 'group_by': 'node'}) == {
+        'counts': {'Mot': 1, 'Hydron': 1}}
+
+
+def test_reopen_after_truncated_index(tmp_path):
+    history = WorldstateHistory(str(tmp_path))
+    history.SNAPSHOTS_PER_BLOCK = 2
+    record_four_snapshots(history)
+    history.close()
+
+    # A második blokk indexsora csak félig íródott ki
+    index_path = os.path.join(str(tmp_path), 'index.jsonl')
+    with open(index_path, 'rb') as f:
+        lines = f.readlines()
+    with open(index_path, 'wb') as f:
+        f.write(lines[0] + lines[1][:len(lines[1]) // 2])
+
+    reopened = WorldstateHistory(str(tmp_path))
+    reopened.SNAPSHOTS_PER_BLOCK = 2
+    assert len(reopened.index) == 1
+    assert [row['ts'] for row in reopened.query('fissures')] == [100, 200]
+
+    reopened.record(worldstate(fissure('f5', 'Ani')), timestamp=600)
+    reopened.close()
+    with open(index_path, 'rb') as f:
+        assert [json.loads(line)['t_min'] for line in f] == [100, 600]
+
+    # Az új blokk a csonka sor után is olvasható marad
+    again = WorldstateHistory(str(tmp_path))
+    assert [(row['ts'], row['key']) for row in again.query('fissures')] == [(100, 'f1'), (200, 'f2'), (600, 'f5')]
+
+
+def test_reopen_ignores_index_entry_without_block_data(tmp_path):
+    history = WorldstateHistory(str(tmp_path))
+    history.SNAPSHOTS_PER_BLOCK = 2
+    record_four_snapshots(history)
+    history.close()
+
+    blocks_path = os.path.join(str(tmp_path), 'blocks.dat')
+    os.truncate(blocks_path, os.path.getsize(blocks_path) - 1)
+    reopened = WorldstateHistory(str(tmp_path))
+    assert len(reopened.index) == 1
+    assert [row['ts'] for row in reopened.query('fissures')] == [100, 200]
@@ -0,0 +1,830 @@
+# Copyright (c) 2024 LexyGuru
+# This file is part of the API_Warframe_Cross_GUI project, licensed under the MIT License.
+# For the full license text, see the LICENSE file in the project root.
+
+# Qt nélküli adatréteg: a GUI és a szkriptek/botok ugyanazt a letöltő- és cache-réteget használják.
+#
+#   from warframe_data_client import WarframeDataClient
+#   client = WarframeDataClient()
+#   readme = client.get_asset("README.md")
+#   worldstate = await client.aget_worldstate()
+#
+# A get_asset a cache-elt másolatot adja vissza; ha a legutóbbi ellenőrzés CONTENT_MAX_AGE-nél régebbi,
+# a háttérben lefut az update_content. Azonnal friss tartalomhoz előbb hívd meg az update_content()-et.
+
+import asyncio
+import functools
+import hashlib
+import json
+import logging
+import math
+import os
+import platform
+import tempfile
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from urllib.parse import quote, unquote, urlsplit
+
+import requests
+
+from content_snapshot import (GITHUB_RAW_URL, GITHUB_TREE_API_URL, VENDOR_ASSETS, git_blob_sha,
+                              is_snapshot_content, open_bundled_snapshot)
+
+WORLDSTATE_URL = "https://api.warframestat.us/{platform}/?language=en"
+ITEM_SEARCH_URL = "https://api.warframestat.us/items/search/{query}"
+WORLDSTATE_MAX_AGE = 60
+CONTENT_MAX_AGE = 60 * 60
+ITEM_SEARCH_MAX_AGE = 24 * 60 * 60
+
+# Az oldalak JS kódja által hívott API-k; az első illeszkedő előtag TTL-je (másodperc) érvényes
+PROXIED_API_HOSTS = {'api.warframestat.us', 'api.warframe.market'}
+API_CACHE_TTLS = [
+    ("https://api.warframestat.us/items", 24 * 60 * 60),
+    ("https://api.warframestat.us/drops", 24 * 60 * 60),
+    ("https://api.warframestat.us/mods", 24 * 60 * 60),
+    ("https://api.warframestat.us/warframes", 24 * 60 * 60),
+    ("https://api.warframestat.us/weapons", 24 * 60 * 60),
+    ("https://api.warframestat.us/", WORLDSTATE_MAX_AGE),
+    ("https://api.warframe.market/", 5 * 60),
+]
+API_CACHE_DEFAULT_TTL = 60
+
+CACHE_DIRECTORY_ENV = 'WARFRAME_INFO_HUB_CACHE_DIR'
+
+# Képek, amelyeket a helyi képcache-en keresztül szolgálunk ki
+PROXIED_IMAGE_HOSTS = {'raw.githubusercontent.com', 'cdn.warframestat.us', 'warframe.market'}
+LOCAL_IMAGE_PREFIXES = ('Icons/',)
+
+
+def api_max_age(url):
+    for prefix, max_age in API_CACHE_TTLS:
+        if url.startswith(prefix):
+            return max_age
+    return API_CACHE_DEFAULT_TTL
+
+
+def get_cache_directory():
+    # A környezeti változóval minden cache (tartalom, képek, naplók, WebEngine) máshová irányítható
+    if os.environ.get(CACHE_DIRECTORY_ENV):
+        return os.environ[CACHE_DIRECTORY_ENV]
+    system = platform.system().lower()
+    if system == 'windows':
+        return os.path.join(os.environ.get('LOCALAPPDATA'), 'WarframeInfoHub')
+    elif system == 'darwin':
+        return os.path.expanduser('~/Library/Caches/WarframeInfoHub')
+    else:  # Linux és egyéb
+        return os.path.expanduser('~/.cache/WarframeInfoHub')
+
+
+class _InFlightCall:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    # Az azonos kulcsra egyszerre érkező kéréseket egyetlen letöltéssé vonja össze
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.coalesced = 0
+
+    def do(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _InFlightCall()
+                self._calls[key] = call
+            else:
+                self.coalesced += 1
+
+        if leader:
+            try:
+                call.result = fn()
+            except Exception as e:
+                call.error = e
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+        else:
+            logging.debug(f"Coalesced request for {key} (total coalesced: {self.coalesced})")
+            call.done.wait()
+
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+DOWNLOAD_ATTEMPTS = 3
+# Az előtöltések legfeljebb HostLatencyTracker.CONCURRENCY_RANGE[1] szálat foglalnak, a maradék a hedge-eké
+FETCH_POOL_SIZE = 12
+
+
+class DownloadIntegrityError(requests.exceptions.RequestException):
+    pass
+
+
+class ResumeRejectedError(requests.exceptions.HTTPError):
+    pass
+
+
+def latency_endpoint(url):
+    parts = urlsplit(url)
+    first_segment = parts.path.lstrip('/').split('/', 1)[0]
+    return f"{parts.hostname or ''}/{first_segment}"
+
+
+class HostLatencyTracker:
+    # Végpontonkénti (host + első útvonalelem) EWMA válaszidő (RTT) és átviteli sebesség; ebből számoljuk az
+    # időkorlátokat, a hedge-elés késleltetését és a párhuzamos előtöltések számát. Külön végpont pl. a gyors
+    # worldstate (/pc) és a több MB-os /items, így az egyik mérései nem torzítják a másik időkorlátjait.
+    RTT_ALPHA = 0.125
+    RTT_VARIANCE_BETA = 0.25
+    THROUGHPUT_ALPHA = 0.2
+    DEFAULT_TIMEOUTS = (5.0, 10.0)
+    CONNECT_TIMEOUT_RANGE = (1.0, 10.0)
+    READ_TIMEOUT_RANGE = (3.0, 60.0)
+    HEDGE_DELAY_RANGE = (0.05, 5.0)
+    MIN_HEDGE_SAMPLES = 5
+    CONCURRENCY_RANGE = (2, 8)
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.endpoints = {}
+
+    def _endpoint(self, endpoint):
+        stats = self.endpoints.get(endpoint)
+        if stats is None:
+            stats = {'rtt': None, 'rtt_var': 0.0, 'throughput': None, 'object_size': None, 'samples': 0,
+                     'timeouts': 0, 'failures': 0, 'hedged': 0, 'hedge_wins': 0}
+            self.endpoints[endpoint] = stats
+        return stats
+
+    @staticmethod
+    def _clamp(value, bounds):
+        return max(bounds[0], min(bounds[1], value))
+
+    def observe_rtt(self, endpoint, seconds):
+        # A fejlécek megérkezéséig eltelt idő, a TCP-ből ismert SRTT/RTTVAR becsléssel
+        with self.lock:
+            stats = self._endpoint(endpoint)
+            if stats['rtt'] is None:
+                stats['rtt'] = seconds
+                stats['rtt_var'] = seconds / 2
+            else:
+                stats['rtt_var'] += self.RTT_VARIANCE_BETA * (abs(seconds - stats['rtt']) - stats['rtt_var'])
+                stats['rtt'] += self.RTT_ALPHA * (seconds - stats['rtt'])
+            stats['samples'] += 1
+
+    def observe_transfer(self, endpoint, size, seconds):
+        with self.lock:
+            stats = self._endpoint(endpoint)
+            stats['object_size'] = size if stats['object_size'] is None else (
+                stats['object_size'] + self.THROUGHPUT_ALPHA * (size - stats['object_size']))
+            # A túl rövid átvitelekből nem lehet sebességet becsülni
+            if size < DOWNLOAD_CHUNK_SIZE or seconds <= 0:
+                return
+            rate = size / seconds
+            stats['throughput'] = rate if stats['throughput'] is None else (
+                stats['throughput'] + self.THROUGHPUT_ALPHA * (rate - stats['throughput']))
+
+    def observe_failure(self, endpoint, timed_out):
+        with self.lock:
+            stats = self._endpoint(endpoint)
+            stats['timeouts' if timed_out else 'failures'] += 1
+            # Időtúllépés után a becslést felfelé korrigáljuk, különben a következő kérés ugyanúgy elbukna
+            if timed_out and stats['rtt'] is not None:
+                stats['rtt_var'] = max(stats['rtt_var'] * 2, stats['rtt'])
+
+    def observe_hedge(self, endpoint):
+        with self.lock:
+            self._endpoint(endpoint)['hedged'] += 1
+
+    def observe_hedge_win(self, endpoint):
+        with self.lock:
+            self._endpoint(endpoint)['hedge_wins'] += 1
+
+    def timeouts(self, endpoint):
+        # (connect, read) időkorlát a requests számára; mérés nélkül a korábbi fix értékek
+        with self.lock:
+            stats = self.endpoints.get(endpoint)
+            if stats is None or stats['rtt'] is None:
+                return self.DEFAULT_TIMEOUTS
+            deviation = stats['rtt'] + 4 * stats['rtt_var']
+            throughput = stats['throughput']
+
+        connect = self._clamp(2 * deviation, self.CONNECT_TIMEOUT_RANGE)
+        # A read timeout két bájt közötti szünetre vonatkozik: egy darab várható ideje a mért sebességgel
+        read = 3 * deviation
+        if throughput:
+            read = max(read, 4 * DOWNLOAD_CHUNK_SIZE / throughput)
+        return connect, self._clamp(read, self.READ_TIMEOUT_RANGE)
+
+    def hedge_delay(self, endpoint):
+        # A válaszidő-eloszlás farka (~p95) után indítunk második kérést; kevés mérésnél nem hedge-elünk
+        with self.lock:
+            stats = self.endpoints.get(endpoint)
+            if stats is None or stats['samples'] < self.MIN_HEDGE_SAMPLES:
+                return None
+            return self._clamp(stats['rtt'] + 2 * stats['rtt_var'], self.HEDGE_DELAY_RANGE)
+
+    def concurrency(self, endpoint):
+        # Kis fájloknál a válaszidő dominál, ezért annyi kérést futtatunk, amennyi kitölti a kapcsolatot
+        with self.lock:
+            stats = self.endpoints.get(endpoint)
+            if stats is None or stats['rtt'] is None:
+                return self.CONCURRENCY_RANGE[0]
+            rtt, throughput, object_size = stats['rtt'], stats['throughput'], stats['object_size']
+        if not throughput or not object_size:
+            return self.CONCURRENCY_RANGE[1]
+        transfer_time = object_size / throughput
+        return int(self._clamp(math.ceil(1 + rtt / max(transfer_time, 1e-3)), self.CONCURRENCY_RANGE))
+
+    def snapshot(self):
+        with self.lock:
+            endpoints = {endpoint: dict(stats) for endpoint, stats in self.endpoints.items()}
+        for endpoint, stats in endpoints.items():
+            stats['timeouts_s'] = self.timeouts(endpoint)
+            stats['hedge_delay_s'] = self.hedge_delay(endpoint)
+            stats['concurrency'] = self.concurrency(endpoint)
+        return endpoints
+
+    def format_report(self):
+        lines = []
+        for endpoint, stats in sorted(self.snapshot().items()):
+            rtt = "n/a" if stats['rtt'] is None else f"{stats['rtt'] * 1000:.0f}±{stats['rtt_var'] * 1000:.0f} ms"
+            throughput = "n/a" if not stats['throughput'] else f"{stats['throughput'] / 1024:.0f} KiB/s"
+            hedge_delay = "off" if stats['hedge_delay_s'] is None else f"{stats['hedge_delay_s'] * 1000:.0f} ms"
+            connect, read = stats['timeouts_s']
+            lines.append(f"{endpoint}: rtt {rtt}, {throughput}, timeouts {connect:.1f}/{read:.1f} s, "
+                         f"hedge after {hedge_delay} ({stats['hedged']} hedged, {stats['hedge_wins']} won), "
+                         f"concurrency {stats['concurrency']}, samples {stats['samples']}, "
+                         f"timeouts {stats['timeouts']}, failures {stats['failures']}")
+        return "\n".join(lines)
+
+
+class ContentCache:
+    # A letöltött gui/ fájlok és a README helyi másolata, blob SHA alapú manifeszttel
+    MANIFEST_NAME = 'manifest.json'
+
+    def __init__(self, root, latency=None):
+        self.root = root
+        self.latency = latency or HostLatencyTracker()
+        self.manifest_path = os.path.join(root, self.MANIFEST_NAME)
+        self.lock = threading.Lock()
+        self.manifest = {'snapshot_version': None, 'checked': 0, 'files': {}}
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                self.manifest.update(json.load(f))
+        except (OSError, json.JSONDecodeError):
+            pass
+
+    def path_for(self, filename):
+        path = os.path.normpath(os.path.join(self.root, filename))
+        if not path.startswith(os.path.normpath(self.root) + os.sep):
+            raise ValueError(f"Invalid cache path: {filename}")
+        return path
+
+    def read(self, filename):
+        if filename not in self.manifest['files']:
+            return None
+        try:
+            with open(self.path_for(filename), 'r', encoding='utf-8') as f:
+                return f.read()
+        except (OSError, ValueError):
+            return None
+
+    def write(self, filename, data, sha=None):
+        path = self.path_for(filename)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = path + '.tmp'
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+        with self.lock:
+            self.manifest['files'][filename] = sha or git_blob_sha(data)
+
+    def fetch(self, url, filename, expected_sha=None):
+        # Darabonként, közvetlenül a cache-be tölt; megszakadás után Range kéréssel folytatja
+        path = self.path_for(filename)
+        part_path = path + '.part'
+        meta_path = part_path + '.json'
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        attempt = 0
+        while True:
+            try:
+                digest = self._fetch_part(url, part_path, meta_path)
+                break
+            except ResumeRejectedError as e:
+                # Pl. 416, mert a .part már a teljes fájl volt: elölről kezdjük, ez nem számít próbálkozásnak
+                logging.warning(f"Resuming {filename} failed ({str(e)}), restarting the download")
+                self._discard_part(part_path, meta_path)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout,
+                    requests.exceptions.ChunkedEncodingError) as e:
+                self.latency.observe_failure(latency_endpoint(url), isinstance(e, requests.exceptions.Timeout))
+                attempt += 1
+                if attempt == DOWNLOAD_ATTEMPTS:
+                    raise
+                logging.warning(f"Download of {filename} interrupted ({str(e)}), resuming (attempt {attempt})")
+
+        if expected_sha is not None and digest != expected_sha:
+            self._discard_part(part_path, meta_path)
+            raise DownloadIntegrityError(f"Checksum mismatch for {filename}: {digest} != {expected_sha}")
+
+        os.replace(part_path, path)
+        self._discard_part(None, meta_path)
+        with self.lock:
+            self.manifest['files'][filename] = digest
+        logging.debug(f"Successfully downloaded {url}")
+        return path
+
+    @staticmethod
+    def _discard_part(part_path, meta_path):
+        for path in (part_path, meta_path):
+            if path is not None and os.path.exists(path):
+                os.remove(path)
+
+    def _fetch_part(self, url, part_path, meta_path):
+        meta = {}
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            pass
+        validator = meta.get('etag') or meta.get('last_modified')
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        if meta.get('url') != url or not validator:
+            offset = 0
+
+        # Tömörítés nélkül kérjük, hogy a Range és a Content-Length a tényleges bájtokra vonatkozzon
+        headers = {'Accept-Encoding': 'identity'}
+        if offset:
+            headers['Range'] = f"bytes={offset}-"
+            headers['If-Range'] = validator
+
+        endpoint = latency_endpoint(url)
+        started = time.monotonic()
+        timeout = self.latency.timeouts(endpoint)
+        with requests.get(url, headers=headers, stream=True, timeout=timeout, verify=True) as response:
+            headers_received = time.monotonic()
+            self.latency.observe_rtt(endpoint, headers_received - started)
+            if offset and not response.ok:
+                raise ResumeRejectedError(f"HTTP {response.status_code} for resumed request", response=response)
+            response.raise_for_status()
+            if response.status_code != 206:
+                # A szerver a teljes tartalmat küldi (nincs Range támogatás, vagy a fájl megváltozott)
+                offset = 0
+            total = self._total_size(response, offset)
+
+            with open(meta_path, 'w', encoding='utf-8') as f:
+                json.dump({'url': url, 'etag': response.headers.get('ETag'),
+                           'last_modified': response.headers.get('Last-Modified')}, f)
+
+            hasher = None
+            if total is not None:
+                hasher = hashlib.sha1(b"blob %d\0" % total)
+                if offset:
+                    with open(part_path, 'rb') as f:
+                        for chunk in iter(lambda: f.read(DOWNLOAD_CHUNK_SIZE), b''):
+                            hasher.update(chunk)
+
+            received = 0
+            with open(part_path, 'ab' if offset else 'wb') as f:
+                for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                    f.write(chunk)
+                    received += len(chunk)
+                    if hasher is not None:
+                        hasher.update(chunk)
+            self.latency.observe_transfer(endpoint, received, time.monotonic() - headers_received)
+
+        size = os.path.getsize(part_path)
+        if total is not None and size != total:
+            raise requests.exceptions.ChunkedEncodingError(f"Incomplete download: {size} of {total} bytes")
+        if hasher is None:
+            # Ismeretlen méretnél a blob SHA-t utólag, a lemezről számoljuk
+            hasher = hashlib.sha1(b"blob %d\0" % size)
+            with open(part_path, 'rb') as f:
+                for chunk in iter(lambda: f.read(DOWNLOAD_CHUNK_SIZE), b''):
+                    hasher.update(chunk)
+        return hasher.hexdigest()
+
+    @staticmethod
+    def _total_size(response, offset):
+        content_range = response.headers.get('Content-Range', '')
+        if response.status_code == 206 and '/' in content_range:
+            total = content_range.rsplit('/', 1)[1]
+            return int(total) if total.isdigit() else None
+        # Tömörített átvitelnél a Content-Length nem a kicsomagolt méret
+        if response.headers.get('Content-Encoding', 'identity') != 'identity':
+            return None
+        length = response.headers.get('Content-Length')
+        return offset + int(length) if length and length.isdigit() else None
+
+    def remove(self, filename):
+        with self.lock:
+            self.manifest['files'].pop(filename, None)
+        try:
+            os.remove(self.path_for(filename))
+        except (OSError, ValueError):
+            pass
+
+    def save_manifest(self):
+        # A zár alatt írunk, egyedi ideiglenes fájlba: párhuzamos mentések nem írják felül egymás fájlját,
+        # és mindig a legfrissebb manifeszt kerül a helyére
+        os.makedirs(self.root, exist_ok=True)
+        with self.lock:
+            data = json.dumps(self.manifest)
+            fd, temp_path = tempfile.mkstemp(prefix=self.MANIFEST_NAME + '.', suffix='.tmp', dir=self.root)
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    f.write(data)
+                os.replace(temp_path, self.manifest_path)
+            except BaseException:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                raise
+
+    def seed_from_snapshot(self, snapshot):
+        # Első indításkor (vagy újabb csomagnál) a beépített pillanatképből töltjük fel a cache-t;
+        # a csomagétól eltérő cache-elt fájlokat is felülírjuk, az update_content utána úgyis ellenőrzi őket
+        if self.manifest['snapshot_version'] == snapshot.version:
+            return 0
+        seeded = 0
+        for name, entry in snapshot.files.items():
+            if self.manifest['files'].get(name) != entry['sha']:
+                self.write(name, snapshot.read(name), entry['sha'])
+                seeded += 1
+        self.manifest['snapshot_version'] = snapshot.version
+        self.save_manifest()
+        logging.info(f"Seeded {seeded} file(s) from content snapshot {snapshot.version}")
+        return seeded
+
+
+class WarframeDataClient:
+    # Szinkron és asyncio felület ugyanarra a lemezes cache-re és letöltési csoportra
+    def __init__(self, cache_dir=None, raw_url=GITHUB_RAW_URL, local_root=None, tree_url=GITHUB_TREE_API_URL,
+                 content_max_age=CONTENT_MAX_AGE):
+        self.cache_dir = cache_dir or get_cache_directory()
+        self.raw_url = raw_url
+        self.tree_url = tree_url
+        # None esetén a cache-elt tartalmat csak az explicit update_content hívás frissíti
+        self.content_max_age = content_max_age
+        self.content_check_thread = None
+        self.content_check_lock = threading.Lock()
+        # A raw_url alatti Icons/ fájlokat innen szolgáljuk ki, ha megvannak helyben
+        self.local_root = local_root
+        self.latency = HostLatencyTracker()
+        self.content_cache = ContentCache(os.path.join(self.cache_dir, 'content'), self.latency)
+        self.image_cache = ContentCache(os.path.join(self.cache_dir, 'images', 'originals'), self.latency)
+        self.api_cache_dir = os.path.join(self.cache_dir, 'api')
+        self.flights = SingleFlight()
+        # A hedge-elt API kérések és az előtöltések közös szálkészlete
+        self.fetch_pool = ThreadPoolExecutor(max_workers=FETCH_POOL_SIZE, thread_name_prefix="HedgedFetch")
+        self.last_content_check = self.content_cache.manifest.get('checked', 0)
+
+    # --- gui/ fájlok és README ---
+
+    def get_asset(self, filename):
+        # Először a helyi cache-ből szolgálunk ki; ha régen ellenőriztük, a háttérben frissítünk
+        cached = self.content_cache.read(filename)
+        if cached is not None:
+            self.check_content_in_background()
+            return cached
+
+        url = self.raw_url + filename
+        try:
+            path = self.flights.do(url, lambda: self.content_cache.fetch(url, filename))
+            self._save_manifest(self.content_cache)
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                return f.read()
+        except requests.exceptions.RequestException as e:
+            logging.error(f"Error downloading file {filename}: {str(e)}")
+            return None
+        except (OSError, ValueError) as e:
+            logging.error(f"Error caching file {filename}: {str(e)}")
+            return None
+
+    def get_vendor_asset(self, url):
+        # A CDN-es szkript helyi útvonala; a pillanatképből vagy az első letöltésből cache-elve, verziózott URL,
+        # ezért nem frissítjük
+        filename = VENDOR_ASSETS[url]
+        path = self.content_cache.path_for(filename)
+        if filename in self.content_cache.manifest['files'] and os.path.exists(path):
+            return path
+
+        path = self.flights.do(url, lambda: self.content_cache.fetch(url, filename))
+        self._save_manifest(self.content_cache)
+        return path
+
+    @staticmethod
+    def _save_manifest(cache):
+        # A letöltés ettől még sikeres; a manifeszt a következő mentéskor pótlódik
+        try:
+            cache.save_manifest()
+        except OSError as e:
+            logging.warning(f"Error saving cache manifest in {cache.root}: {str(e)}")
+
+    def seed_from_bundle(self, bundle_dir):
+        snapshot = open_bundled_snapshot(bundle_dir)
+        if snapshot is None:
+            return 0
+        with snapshot:
+            return self.content_cache.seed_from_snapshot(snapshot)
+
+    def check_content_in_background(self):
+        if self.content_max_age is None or time.time() - self.last_content_check < self.content_max_age:
+            return
+        with self.content_check_lock:
+            if self.content_check_thread is not None and self.content_check_thread.is_alive():
+                return
+            # Sikertelen ellenőrzés után is csak content_max_age múlva próbáljuk újra
+            self.last_content_check = time.time()
+            self.content_check_thread = threading.Thread(target=self.update_content, name="ContentCheck",
+                                                         daemon=True)
+            self.content_check_thread.start()
+
+    def update_content(self):
+        # Az egyszerre indított frissítések (GUI indulás, háttérellenőrzés) egyetlen futássá vonódnak össze
+        return self.flights.do(self.tree_url, self._update_content)
+
+    def _update_content(self):
+        # A GitHub fa alapján csak a megváltozott fájlokat tölti le újra
+        self.last_content_check = time.time()
+        try:
+            response = requests.get(self.tree_url, timeout=self.latency.timeouts(latency_endpoint(self.tree_url)),
+                                    verify=True)
+            response.raise_for_status()
+            remote = {entry['path']: entry for entry in response.json().get('tree', [])
+                      if entry.get('type') == 'blob' and is_snapshot_content(entry['path'])}
+        except (requests.exceptions.RequestException, ValueError) as e:
+            logging.error(f"Error checking content updates: {str(e)}")
+            return 0
+
+        cache = self.content_cache
+        local = dict(cache.manifest['files'])
+        # A kis fájlok előre kerülnek, így a legtöbb oldal hamar frissül
+        changed = sorted((entry for path, entry in remote.items() if local.get(path) != entry['sha']),
+                         key=lambda entry: entry.get('size', 0))
+        # A vendor/ szkriptek nincsenek a GitHub fában, ezért csak a fából származó fájlokat töröljük
+        removed = [path for path in local if path not in remote and is_snapshot_content(path)]
+        self._prefetch(changed)
+        for path in removed:
+            cache.remove(path)
+        with cache.lock:
+            cache.manifest['checked'] = int(time.time())
+        self._save_manifest(cache)
+        logging.info(f"Content update: {len(changed)} changed, {len(removed)} removed file(s)")
+        return len(changed) + len(removed)
+
+    def _prefetch(self, entries):
+        # A párhuzamos letöltések számát minden befejezett fájl után a mért RTT és sebesség alapján igazítjuk
+        endpoint = latency_endpoint(self.raw_url)
+        queued = list(reversed(entries))
+        running = set()
+        while queued or running:
+            while queued and len(running) < self.latency.concurrency(endpoint):
+                running.add(self.fetch_pool.submit(self._update_file, queued.pop()))
+            _, running = wait(running, return_when=FIRST_COMPLETED)
+
+    def _update_file(self, entry):
+        path = entry['path']
+        url = self.raw_url + path
+        try:
+            self.flights.do(url, lambda: self.content_cache.fetch(url, path, entry['sha']))
+        except (requests.exceptions.RequestException, OSError) as e:
+            logging.error(f"Error updating {path}: {str(e)}")
+
+    # --- JSON API-k ---
+
+    def _api_cache_paths(self, url):
+        base = os.path.join(self.api_cache_dir, hashlib.sha1(url.encode('utf-8')).hexdigest())
+        return base + '.body', base + '.meta.json'
+
+    def cached_response_path(self, url, max_age=None):
+        # A cache-elt válasz (törzs útvonala, content_type), vagy None, ha nincs vagy max_age-nél régebbi
+        body_path, meta_path = self._api_cache_paths(url)
+        try:
+            if max_age is not None and time.time() - os.path.getmtime(body_path) >= max_age:
+                return None
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+        return body_path, meta.get('content_type')
+
+    @staticmethod
+    def _read_body(cached):
+        body_path, content_type = cached
+        with open(body_path, 'rb') as f:
+            return f.read(), content_type
+
+    def read_cached_response(self, url, max_age=None):
+        cached = self.cached_response_path(url, max_age)
+        try:
+            return self._read_body(cached) if cached is not None else None
+        except OSError:
+            return None
+
+    def get_response_path(self, url, max_age=None):
+        # Végpontonkénti TTL-lel cache-elt GET; hiba esetén a régebbi másolatot adjuk vissza.
+        # A törzs lemezen marad, így a nagy (pl. /items) válaszok folyamként továbbíthatók.
+        if max_age is None:
+            max_age = api_max_age(url)
+        cached = self.cached_response_path(url, max_age)
+        if cached is not None:
+            return cached
+
+        try:
+            return self.flights.do(url, lambda: self._fetch_response(url))
+        except requests.exceptions.RequestException as e:
+            logging.error(f"Error fetching {url}: {str(e)}")
+            stale = self.cached_response_path(url)
+            if stale is None:
+                raise
+            return stale
+
+    def get_response(self, url, max_age=None):
+        return self._read_body(self.get_response_path(url, max_age))
+
+    def _open_response(self, url):
+        # Csak a fejlécekig vár; a törzset a hívó olvassa (és méri) folyamként
+        endpoint = latency_endpoint(url)
+        started = time.monotonic()
+        try:
+            response = requests.get(url, timeout=self.latency.timeouts(endpoint), stream=True, verify=True)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            self.latency.observe_failure(endpoint, isinstance(e, requests.exceptions.Timeout))
+            raise
+        self.latency.observe_rtt(endpoint, time.monotonic() - started)
+        return response
+
+    @staticmethod
+    def _close_response(future):
+        if not future.cancelled() and future.exception() is None:
+            future.result().close()
+
+    def _hedged_get(self, url):
+        # Ha a fejlécek a végpont szokásos válaszidején túl késnek, egy második kérést is indítunk; az első nyer.
+        # A hedge csak a fejlécekig tart, így a nagy válaszok törzse egyszer töltődik le.
+        endpoint = latency_endpoint(url)
+        delay = self.latency.hedge_delay(endpoint)
+        if delay is None:
+            return self._open_response(url)
+
+        primary = self.fetch_pool.submit(self._open_response, url)
+        done, _ = wait([primary], timeout=delay)
+        if done:
+            return primary.result()
+
+        self.latency.observe_hedge(endpoint)
+        hedge = self.fetch_pool.submit(self._open_response, url)
+        running = {primary, hedge}
+        error = None
+        while running:
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    response = future.result()
+                except requests.exceptions.RequestException as e:
+                    error = e
+                    continue
+                # A vesztes kérés kapcsolatát lezárjuk, amint megérkezik
+                for other in (running | done) - {future}:
+                    other.add_done_callback(self._close_response)
+                if future is hedge:
+                    self.latency.observe_hedge_win(endpoint)
+                return response
+        raise error
+
+    def _fetch_response(self, url):
+        # Darabonként, egyedi ideiglenes fájlba tölt, így a memóriahasználat a válasz méretétől független
+        endpoint = latency_endpoint(url)
+        body_path, meta_path = self._api_cache_paths(url)
+        os.makedirs(self.api_cache_dir, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(suffix='.tmp', dir=self.api_cache_dir)
+        try:
+            with os.fdopen(fd, 'wb') as f, self._hedged_get(url) as response:
+                response.raise_for_status()
+                content_type = response.headers.get('Content-Type', 'application/octet-stream')
+                started = time.monotonic()
+                received = 0
+                for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                    f.write(chunk)
+                    received += len(chunk)
+                self.latency.observe_transfer(endpoint, received, time.monotonic() - started)
+
+            meta_temp_path = meta_path + '.tmp'
+            with open(meta_temp_path, 'w', encoding='utf-8') as f:
+                json.dump({'url': url, 'content_type': content_type}, f)
+            os.replace(meta_temp_path, meta_path)
+            os.replace(temp_path, body_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        logging.debug(f"Successfully downloaded {url}")
+        return body_path, content_type
+
+    def get_json(self, url, max_age=None):
+        try:
+            body, _ = self.get_response(url, max_age)
+            return json.loads(body)
+        except (requests.exceptions.RequestException, ValueError):
+            return None
+
+    def get_worldstate(self, platform='pc', max_age=WORLDSTATE_MAX_AGE):
+        return self.get_json(WORLDSTATE_URL.format(platform=platform), max_age)
+
+    def fetch_worldstate(self, platform='pc'):
+        # Mindig hálózatról kér, és hiba esetén kivételt dob (a háttérfigyelő ezt használja)
+        url = WORLDSTATE_URL.format(platform=platform)
+        body, _ = self._read_body(self.flights.do(url, lambda: self._fetch_response(url)))
+        return json.loads(body)
+
+    def cached_worldstate(self, platform='pc'):
+        cached = self.read_cached_response(WORLDSTATE_URL.format(platform=platform))
+        try:
+            return json.loads(cached[0]) if cached is not None else None
+        except ValueError:
+            return None
+
+    def search_items(self, query, max_age=ITEM_SEARCH_MAX_AGE):
+        return self.get_json(ITEM_SEARCH_URL.format(query=quote(query.strip().lower(), safe='')), max_age) or []
+
+    # --- képek ---
+
+    def local_image_path(self, url):
+        if not self.local_root or not url.startswith(self.raw_url):
+            return None
+        relative = url[len(self.raw_url):].split('?', 1)[0]
+        if not relative.startswith(LOCAL_IMAGE_PREFIXES):
+            return None
+        root = os.path.abspath(self.local_root)
+        path = os.path.normpath(os.path.join(root, unquote(relative)))
+        if path.startswith(root + os.sep) and os.path.isfile(path):
+            return path
+        return None
+
+    def get_image(self, url):
+        # Minden kép csak egyszer töltődik le; a visszatérési érték a helyi fájl útvonala
+        local = self.local_image_path(url)
+        if local is not None:
+            return local
+
+        extension = os.path.splitext(urlsplit(url).path)[1].lower()
+        if not extension.isascii() or len(extension) > 5:
+            extension = ''
+        filename = hashlib.sha1(url.encode('utf-8')).hexdigest() + extension
+        path = self.image_cache.path_for(filename)
+        if filename in self.image_cache.manifest['files'] and os.path.exists(path):
+            return path
+
+        path = self.flights.do(url, lambda: self.image_cache.fetch(url, filename))
+        self._save_manifest(self.image_cache)
+        return path
+
+    # --- asyncio felület ---
+
+    async def _run(self, method, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(method, *args, **kwargs))
+
+    async def aget_asset(self, filename):
+        return await self._run(self.get_asset, filename)
+
+    async def aget_worldstate(self, platform='pc', max_age=WORLDSTATE_MAX_AGE):
+        return await self._run(self.get_worldstate, platform, max_age)
+
+    async def asearch_items(self, query, max_age=ITEM_SEARCH_MAX_AGE):
+        return await self._run(self.search_items, query, max_age)
+
+    async def aget_image(self, url):
+        return await self._run(self.get_image, url)
+
+    async def aupdate_content(self):
+        return await self._run(self.update_content)
+
+
+_default_client = None
+_default_client_lock = threading.Lock()
+
+
+def get_data_client():
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = WarframeDataClient()
+        return _default_client
+
+
+def set_data_client(client):
+    # A megosztott kliens lecserélése (pl. a soak teszt helyi tartalomszerveréhez)
+    global _default_client
+    with _default_client_lock:
+        _default_client = client
@@ -0,0 +1,191 @@
+# Copyright (c) 2024 LexyGuru
+# This file is part of the API_Warframe_Cross_GUI project, licensed under the MIT License.
+# For the full license text, see the LICENSE file in the project root.
+
+# Worldstate figyelési szabályok kiértékelése (Qt nélkül).
+# Szabály: {"type": "fissures", "match": {"tier": "Axi"}, "message": "..."}; az "id" opcionális,
+# megadása nélkül a szabály tartalmából képzett, pozíciótól független azonosítót kap.
+
+import hashlib
+import json
+import logging
+
+from worldstate_history import entity_hash, entity_key
+
+
+def worldstate_entities(worldstate, entity_type):
+    value = worldstate.get(entity_type)
+    if isinstance(value, list):
+        return [entity for entity in value if isinstance(entity, dict)]
+    if isinstance(value, dict):
+        return [value]
+    return []
+
+
+def resolve_field(entity, path):
+    # Pontozott útvonal ("inventory.item"); listán áthaladva minden elem értékét visszaadja
+    values = [entity]
+    for part in path.split('.'):
+        next_values = []
+        for value in values:
+            if isinstance(value, list):
+                next_values.extend(item.get(part) for item in value if isinstance(item, dict))
+            elif isinstance(value, dict):
+                next_values.append(value.get(part))
+        values = next_values
+    flat = []
+    for value in values:
+        if isinstance(value, list):
+            flat.extend(value)
+        elif value is not None:
+            flat.append(value)
+    return flat
+
+
+def normalize_match_value(value):
+    return value.strip().lower() if isinstance(value, str) else value
+
+
+def validate_rule(rule):
+    # Hibaüzenet, ha a szabály nem értékelhető ki; None, ha rendben van
+    if not isinstance(rule, dict):
+        return "rule must be an object"
+    if not isinstance(rule.get('type'), str) or not rule['type']:
+        return "'type' must be a non-empty string"
+    match = rule.get('match')
+    if match is not None and not isinstance(match, dict):
+        return "'match' must be an object"
+    for field, expected in (match or {}).items():
+        expected_values = expected if isinstance(expected, list) else [expected]
+        if not expected_values or any(isinstance(value, (dict, list)) for value in expected_values):
+            return f"match value for '{field}' must be a scalar or a non-empty list of scalars"
+    if rule.get('id') is not None and not isinstance(rule['id'], (str, int)):
+        return "'id' must be a string or a number"
+    if rule.get('message') is not None and not isinstance(rule['message'], str):
+        return "'message' must be a string"
+    return None
+
+
+def rule_signature(rule):
+    content = {key: value for key, value in rule.items() if key != 'id'}
+    return hashlib.md5(json.dumps(content, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+class AlertEngine:
+    # A figyelési szabályokat entitástípus és mezőérték szerint indexeli,
+    # és csak a megváltozott entitásokat értékeli ki
+    def __init__(self, rules=None, fired=None):
+        self.previous = {}
+        self.fired = {tuple(entry) for entry in fired or ()
+                      if isinstance(entry, (list, tuple)) and len(entry) == 3}
+        self.signatures = {}
+        self.rules = []
+        self.index = {}
+        # Szabályok nélkül a betöltött jelzéseket sem szűrjük: azokat az első set_rules hívás veti össze
+        if rules is not None:
+            self.set_rules(rules)
+
+    def set_rules(self, rules):
+        self.rules = []
+        signatures = {}
+        for number, rule in enumerate(rules):
+            error = validate_rule(rule)
+            if error is not None:
+                logging.error(f"Skipping invalid alert rule #{number + 1}: {error}")
+                continue
+            signature = rule_signature(rule)
+            rule = dict(rule, id=str(rule.get('id') or f"rule-{signature[:12]}"))
+            if rule['id'] in signatures:
+                continue
+            signatures[rule['id']] = signature
+            self.rules.append(rule)
+
+        # Új vagy módosított szabálynál a típus összes aktuális entitását újraértékeljük,
+        # így a már futó eseményekre (pl. Baro látogatás) is jelez
+        changed_ids = {rule_id for rule_id, signature in signatures.items()
+                       if self.signatures.get(rule_id) != signature}
+        for rule in self.rules:
+            if rule['id'] in changed_ids:
+                self.previous.pop(rule['type'], None)
+        # A jelzések a szabály tartalmához kötődnek, így szerkesztés után a szabály újra jelezhet
+        known = set(signatures.values())
+        self.fired = {fired for fired in self.fired if fired[0] in known}
+        self.signatures = signatures
+
+        self.index = {}
+        for rule in self.rules:
+            match = rule.get('match') or {}
+            type_index = self.index.setdefault(rule['type'], {'fields': {}, 'unconditional': []})
+            if not match:
+                type_index['unconditional'].append(rule)
+                continue
+            # Az első feltétel mezője a szabály kulcsa az indexben
+            field, expected = next(iter(match.items()))
+            expected_values = expected if isinstance(expected, list) else [expected]
+            field_index = type_index['fields'].setdefault(field, {})
+            for value in expected_values:
+                field_index.setdefault(normalize_match_value(value), []).append(rule)
+
+    @staticmethod
+    def rule_matches(rule, entity):
+        for field, expected in (rule.get('match') or {}).items():
+            expected_values = {normalize_match_value(value)
+                               for value in (expected if isinstance(expected, list) else [expected])}
+            actual_values = {normalize_match_value(value) for value in resolve_field(entity, field)
+                             if not isinstance(value, (dict, list))}
+            if not expected_values & actual_values:
+                return False
+        return True
+
+    def candidate_rules(self, entity_type, entity):
+        type_index = self.index[entity_type]
+        candidates = {rule['id']: rule for rule in type_index['unconditional']}
+        for field, field_index in type_index['fields'].items():
+            for value in resolve_field(entity, field):
+                if isinstance(value, (dict, list)):
+                    continue
+                for rule in field_index.get(normalize_match_value(value), ()):
+                    candidates[rule['id']] = rule
+        return candidates.values()
+
+    def changed_entities(self, worldstate):
+        changes = []
+        current = {}
+        for entity_type in self.index:
+            previous = self.previous.get(entity_type, {})
+            entities = {}
+            for entity in worldstate_entities(worldstate, entity_type):
+                key = entity_key(entity)
+                digest = entity_hash(entity)
+                entities[key] = digest
+                if previous.get(key) != digest:
+                    changes.append((entity_type, key, entity))
+            current[entity_type] = entities
+        self.previous = current
+        return changes
+
+    def evaluate(self, worldstate):
+        alerts = []
+        for entity_type, key, entity in self.changed_entities(worldstate):
+            for rule in self.candidate_rules(entity_type, entity):
+                fired_key = (self.signatures[rule['id']], entity_type, key)
+                if fired_key in self.fired or not self.rule_matches(rule, entity):
+                    continue
+                self.fired.add(fired_key)
+                alerts.append((rule, entity))
+
+        # Az eltűnt entitásokhoz tartozó jelzéseket elfelejtjük
+        self.fired = {fired for fired in self.fired if fired[2] in self.previous.get(fired[1], {})}
+        return alerts
+
+    def fired_state(self):
+        # A már jelzett (szabály, típus, entitás) hármasok, újraindítás utáni betöltéshez
+        return sorted(list(fired) for fired in self.fired)
+
+    @staticmethod
+    def describe(rule, entity):
+        if rule.get('message'):
+            return rule['message']
+        details = [str(entity[field]) for field in ('tier', 'missionType', 'type', 'node', 'location', 'character')
+                   if entity.get(field)]
+        return f"{rule['type']}: {', '.join(details)}" if details else rule['type']
@@ -0,0 +1,312 @@
+# Copyright (c) 2024 LexyGuru
+# This file is part of the API_Warframe_Cross_GUI project, licensed under the MIT License.
+# For the full license text, see the LICENSE file in the project root.
+
+# Csak hozzáfűzhető worldstate-történet oszlopos, tömörített blokkokban.
+# Minden lekérdezésnél csak az új vagy megváltozott entitások kerülnek tárolásra;
+# a blokkok időtartományát és típusait az index.jsonl írja le, így a lekérdezések
+# csak az érintett blokkok szükséges oszlopait olvassák be.
+
+import array
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import zlib
+from collections import Counter
+from itertools import accumulate
+
+HISTORY_BLOCKS_NAME = 'blocks.dat'
+HISTORY_INDEX_NAME = 'index.jsonl'
+HISTORY_STATE_NAME = 'state.json'
+
+# Ezek a mezők minden lekérdezésnél változnak, a változásfigyelés szempontjából nem számítanak
+VOLATILE_FIELDS = {'eta', 'startString', 'endString', 'timeLeft', 'expired'}
+
+COLUMN_SEPARATOR = '\x00'
+
+
+def entity_key(entity):
+    if entity.get('id'):
+        return str(entity['id'])
+    identity = [str(entity.get(field, '')) for field in ('activation', 'node', 'expiry')]
+    if any(identity):
+        return '|'.join(identity)
+    return json.dumps(entity, sort_keys=True)
+
+
+def entity_hash(entity):
+    stable = {key: value for key, value in entity.items() if key not in VOLATILE_FIELDS}
+    return hashlib.md5(json.dumps(stable, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+def iter_entities(worldstate):
+    for entity_type, value in worldstate.items():
+        if isinstance(value, list):
+            for entity in value:
+                if isinstance(entity, dict):
+                    yield entity_type, entity
+        elif isinstance(value, dict):
+            yield entity_type, value
+
+
+def encode_block(rows):
+    # A sorokat típus szerint rendezzük, így egy típus a blokkon belül egyetlen összefüggő tartomány
+    rows = sorted(rows, key=lambda row: row[1])
+    type_ranges = {}
+    for position, row in enumerate(rows):
+        type_ranges.setdefault(row[1], [position, 0])[1] += 1
+
+    timestamps = array.array('q')
+    previous = 0
+    for row in rows:
+        timestamps.append(row[0] - previous)
+        previous = row[0]
+
+    columns = {
+        'ts': timestamps.tobytes(),
+        'key': COLUMN_SEPARATOR.join(row[2] for row in rows).encode('utf-8'),
+        'node': COLUMN_SEPARATOR.join(row[3] for row in rows).encode('utf-8'),
+        'payload': '\n'.join(row[4] for row in rows).encode('utf-8'),
+    }
+    return type_ranges, {name: zlib.compress(data, 6) for name, data in columns.items()}
+
+
+class WorldstateHistory:
+    SNAPSHOTS_PER_BLOCK = 60
+
+    def __init__(self, root):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self.blocks_path = os.path.join(root, HISTORY_BLOCKS_NAME)
+        self.index_path = os.path.join(root, HISTORY_INDEX_NAME)
+        self.state_path = os.path.join(root, HISTORY_STATE_NAME)
+        self.lock = threading.Lock()
+        self.pending = []
+        self.pending_snapshots = 0
+        self.index = self.load_index()
+        self.state = self.load_state()
+
+    def load_index(self):
+        try:
+            blocks_size = os.path.getsize(self.blocks_path)
+        except OSError:
+            blocks_size = 0
+        index = []
+        valid_length = 0
+        try:
+            with open(self.index_path, 'rb') as f:
+                for line in f:
+                    # Félbeszakadt írás: a sor eleje megvan, a vége (vagy a blokk adata) nem
+                    if not line.endswith(b'\n'):
+                        break
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        break
+                    if entry['offset'] + entry['length'] > blocks_size:
+                        break
+                    index.append(entry)
+                    valid_length += len(line)
+                index_size = f.seek(0, os.SEEK_END)
+            if index_size > valid_length:
+                # A csonka farkat levágjuk, különben a következő hozzáfűzött sor is olvashatatlan lenne
+                logging.warning(f"Truncating {index_size - valid_length} byte(s) of incomplete history index")
+                os.truncate(self.index_path, valid_length)
+        except OSError:
+            pass
+        return index
+
+    def load_state(self):
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def record(self, worldstate, timestamp=None):
+        timestamp = int(timestamp if timestamp is not None else time.time())
+        with self.lock:
+            current = {}
+            for entity_type, entity in iter_entities(worldstate):
+                key = entity_key(entity)
+                digest = entity_hash(entity)
+                current.setdefault(entity_type, {})[key] = digest
+                if self.state.get(entity_type, {}).get(key) != digest:
+                    payload = json.dumps(entity, separators=(',', ':'), default=str)
+                    self.pending.append((timestamp, entity_type, key, str(entity.get('node') or ''), payload))
+            self.state = current
+            self.pending_snapshots += 1
+            if self.pending_snapshots >= self.SNAPSHOTS_PER_BLOCK:
+                self._flush()
+
+    def flush(self):
+        with self.lock:
+            self._flush()
+
+    def _flush(self):
+        self.pending_snapshots = 0
+        if not self.pending:
+            self._save_state()
+            return
+
+        rows = self.pending
+        type_ranges, columns = encode_block(rows)
+        with open(self.blocks_path, 'ab') as f:
+            offset = f.tell()
+            layout = {}
+            position = 0
+            for name, data in columns.items():
+                f.write(data)
+                layout[name] = [position, len(data)]
+                position += len(data)
+
+        entry = {
+            'offset': offset,
+            'length': position,
+            't_min': rows[0][0],
+            't_max': rows[-1][0],
+            'rows': len(rows),
+            'type_ranges': type_ranges,
+            'columns': layout,
+        }
+        with open(self.index_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, separators=(',', ':')) + '\n')
+        self.index.append(entry)
+        self.pending = []
+        self._save_state()
+        logging.debug(f"History block written: {len(rows)} rows, {position} bytes")
+
+    def _save_state(self):
+        temp_path = self.state_path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f)
+        os.replace(temp_path, self.state_path)
+
+    def close(self):
+        self.flush()
+
+    @staticmethod
+    def _read_column(f, entry, name):
+        start, length = entry['columns'][name]
+        f.seek(entry['offset'] + start)
+        return zlib.decompress(f.read(length))
+
+    def _iter_blocks(self, entity_type, since, until):
+        for entry in self.index:
+            if since is not None and entry['t_max'] < since:
+                continue
+            if until is not None and entry['t_min'] > until:
+                continue
+            if entity_type in entry['type_ranges']:
+                yield entry
+
+    def _matching_rows(self, f, entry, entity_type, since, until, need_timestamps):
+        # A típus tartománya az indexből jön; időbélyeget csak a blokkhatárokon vagy kérésre bontunk ki
+        start, count = entry['type_ranges'][entity_type]
+        positions = range(start, start + count)
+        whole_block = (since is None or entry['t_min'] >= since) and (until is None or entry['t_max'] <= until)
+        if whole_block and not need_timestamps:
+            return positions, None
+
+        deltas = array.array('q')
+        deltas.frombytes(self._read_column(f, entry, 'ts'))
+        timestamps = list(accumulate(deltas))
+        if not whole_block:
+            positions = [position for position in positions
+                         if (since is None or timestamps[position] >= since)
+                         and (until is None or timestamps[position] <= until)]
+        return positions, timestamps
+
+    def _pending_rows(self, entity_type, since, until):
+        return [row for row in self.pending
+                if row[1] == entity_type and (since is None or row[0] >= since) and (until is None or row[0] <= until)]
+
+    def _scan(self, entity_type, since, until, columns, need_timestamps=True):
+        # Blokkonként a találatok pozíciói és a kért oszlopok; a többi oszlopot be sem olvassuk
+        try:
+            f = open(self.blocks_path, 'rb')
+        except OSError:
+            f = None
+        try:
+            for entry in (self._iter_blocks(entity_type, since, until) if f is not None else ()):
+                positions, timestamps = self._matching_rows(f, entry, entity_type, since, until, need_timestamps)
+                if not positions:
+                    continue
+                values = {}
+                for name in columns:
+                    separator = '\n' if name == 'payload' else COLUMN_SEPARATOR
+                    values[name] = self._read_column(f, entry, name).decode('utf-8').split(separator)
+                yield positions, timestamps, values
+        finally:
+            if f is not None:
+                f.close()
+
+        pending = self._pending_rows(entity_type, since, until)
+        if pending:
+            values = {'key': [row[2] for row in pending], 'node': [row[3] for row in pending],
+                      'payload': [row[4] for row in pending]}
+            yield range(len(pending)), [row[0] for row in pending], values
+
+    def query(self, entity_type, since=None, until=None, fields=None, limit=None):
+        # Az adott típus sorai időrendben; a payload oszlopot csak akkor olvassuk, ha kell
+        columns = ['key', 'node']
+        if fields is None or any(field not in ('key', 'node', 'ts') for field in fields):
+            columns.append('payload')
+        results = []
+        with self.lock:
+            for positions, timestamps, values in self._scan(entity_type, since, until, columns):
+                payloads = values.get('payload')
+                for position in positions:
+                    results.append(self._make_result(timestamps[position], values['key'][position],
+                                                     values['node'][position],
+                                                     payloads[position] if payloads else None, fields))
+                    if limit is not None and len(results) >= limit:
+                        return results
+        return results
+
+    @staticmethod
+    def _make_result(timestamp, key, node, payload, fields):
+        result = {'ts': timestamp, 'key': key, 'node': node}
+        if payload is not None:
+            entity = json.loads(payload)
+            if fields is None:
+                result['entity'] = entity
+            else:
+                result.update({field: entity.get(field) for field in fields if field not in result})
+        if fields is not None:
+            result = {field: result.get(field) for field in ['ts'] + list(fields)}
+        return result
+
+    def count_by(self, entity_type, field, since=None, until=None):
+        # Gyakoriság mező szerint (pl. fissure-ök node-onként); a node és key mezőhöz nem kell a payload
+        counts = Counter()
+        column = field if field in ('key', 'node') else 'payload'
+        with self.lock:
+            for positions, _, values in self._scan(entity_type, since, until, [column], need_timestamps=False):
+                column_values = values[column]
+                if column != 'payload':
+                    if isinstance(positions, range):
+                        counts.update(column_values[positions.start:positions.stop])
+                    else:
+                        counts.update(column_values[position] for position in positions)
+                    continue
+                for position in positions:
+                    value = json.loads(column_values[position]).get(field)
+                    if isinstance(value, (dict, list)):
+                        value = json.dumps(value, sort_keys=True)
+                    counts[str(value)] += 1
+        return dict(counts)
+
+    def run_query(self, query):
+        # A WebBridge-en érkező JSON lekérdezés kiértékelése
+        entity_type = query['type']
+        until = query.get('until')
+        since = query.get('since')
+        if since is None and query.get('days') is not None:
+            since = int((until or time.time()) - float(query['days']) * 86400)
+        if query.get('group_by'):
+            return {'counts': self.count_by(entity_type, query['group_by'], since, until)}
+        return {'rows': self.query(entity_type, since, until, query.get('fields'), query.get('limit', 1000))}